@@ -0,0 +1,48 @@
+"""Compare the per-cell and vectorized construction of GridGeo.geometry.
+
+Run with:
+
+    python benchmarks/bench_geometry.py [N]
+
+where `N` is the number of nodes along each grid axis (default 500).
+
+"""
+
+import sys
+import timeit
+from itertools import zip_longest
+
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon
+
+from gridgeo.cfvariable import _make_grid
+from gridgeo.gridgeo import _cell_geometries
+
+
+def _coords(n):
+    x, y = np.meshgrid(np.linspace(-75, -70, n), np.linspace(38, 42, n))
+    return np.stack([x, y], axis=2)
+
+
+def per_cell(polygons):
+    return MultiPolygon(list(zip_longest(polygons, [])))
+
+
+def vectorized(polygons):
+    return shapely.multipolygons(_cell_geometries(polygons))
+
+
+def main(n=500, number=3):
+    polygons = _make_grid(_coords(n))
+    assert per_cell(polygons).equals_exact(vectorized(polygons), 0)
+    print(f"{len(polygons)} cells")
+    for func in (per_cell, vectorized):
+        elapsed = min(
+            timeit.repeat(lambda f=func: f(polygons), number=1, repeat=number),
+        )
+        print(f"{func.__name__:>12}: {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
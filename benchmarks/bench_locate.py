@@ -0,0 +1,62 @@
+"""Compare the GridGeo.locate engines on the test grids.
+
+Run with:
+
+    python benchmarks/bench_locate.py [NPOINTS]
+
+where `NPOINTS` is the number of random points to locate (default 1000000).
+Each engine runs on a new grid, so the timings include its index build.
+
+With 300000 points, on a single core:
+
+    grid          cells   strtree   kdtree   searchsorted
+    sgrid         43688   0.99 s    0.29 s
+    unknown_1d   136500   1.71 s    0.73 s   0.07 s
+    unknown_2d    12706   0.67 s    0.48 s
+
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import gridgeo
+
+data = Path(__file__).parent.parent.joinpath("tests", "data")
+
+datasets = {
+    "sgrid.nc": "sea_water_potential_temperature",
+    "unknown_1d.nc": "sea_water_potential_temperature",
+    "unknown_2d.nc": "sea_water_temperature",
+}
+
+
+def main(npoints=1_000_000):
+    rng = np.random.default_rng(42)
+    # Imported out of the timings.
+    import scipy.spatial  # noqa: F401, PLC0415
+
+    for name, standard_name in datasets.items():
+        fname = data.joinpath(name)
+        grid = gridgeo.GridGeo(fname, standard_name=standard_name)
+        coords = grid.polygons.valid_coords()
+        (xmin, ymin), (xmax, ymax) = coords.min(axis=0), coords.max(axis=0)
+        lon = rng.uniform(xmin, xmax, npoints)
+        lat = rng.uniform(ymin, ymax, npoints)
+        engines = ["auto", "strtree", "kdtree"]
+        if grid.mesh == "unknown_1d":
+            engines.append("searchsorted")
+        print(f"{name}: {len(grid.polygons)} cells, {npoints} points")
+        for engine in engines:
+            grid = gridgeo.GridGeo(fname, standard_name=standard_name)
+            grid.polygons  # noqa: B018
+            start = time.perf_counter()
+            grid.locate(lon, lat, engine=engine)
+            elapsed = time.perf_counter() - start
+            print(f"{engine:>14}: {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,59 @@
+"""Compare the union, parallel, and boundary engines of GridGeo.outline.
+
+Run with:
+
+    python benchmarks/bench_outline.py [N]
+
+where `N` is the number of nodes along each grid axis (default 500). The grid
+has a land mask with a few circular "islands" to exercise the holes.
+
+"""
+
+import sys
+import timeit
+
+import numpy as np
+
+from gridgeo.cfvariable import _make_grid
+from gridgeo.outline import (
+    parallel_union,
+    polygonize_boundary,
+    structured_boundary,
+    union_outline,
+)
+
+
+def _coords(n):
+    x, y = np.meshgrid(np.linspace(-75, -70, n), np.linspace(38, 42, n))
+    for cx, cy, r in ((-74, 39, 0.5), (-72, 41, 0.3), (-71, 38.5, 0.4)):
+        land = (x - cx) ** 2 + (y - cy) ** 2 < r**2
+        x[land] = y[land] = np.nan
+    return np.stack([x, y], axis=2)
+
+
+def union(polygons):
+    return union_outline(polygons)
+
+
+def parallel(polygons):
+    return parallel_union(polygons)
+
+
+def boundary(polygons):
+    return polygonize_boundary(structured_boundary(polygons))
+
+
+def main(n=500, number=3):
+    polygons = _make_grid(_coords(n))
+    assert union(polygons).equals(boundary(polygons))
+    assert union(polygons).equals(parallel(polygons))
+    print(f"{len(polygons)} cells")
+    for func in (union, parallel, boundary):
+        elapsed = min(
+            timeit.repeat(lambda f=func: f(polygons), number=1, repeat=number),
+        )
+        print(f"{func.__name__:>10}: {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -1,8 +1,9 @@
 """GridGeo."""
 
+from gridgeo.factory import GridCache, get_grid, grid_cache
 from gridgeo.gridgeo import GridGeo
 
-__all__ = ["GridGeo"]
+__all__ = ["GridCache", "GridGeo", "get_grid", "grid_cache"]
 
 try:
     from ._version import __version__
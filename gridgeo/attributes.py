@@ -0,0 +1,110 @@
+"""Attribute index for fast variable lookups in a netCDF4.Dataset."""
+
+import weakref
+
+import netCDF4
+import numpy as np
+
+_indexes = weakref.WeakKeyDictionary()
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _equal(value, other):
+    if isinstance(value, np.ndarray) or isinstance(other, np.ndarray):
+        return np.array_equal(value, other)
+    return bool(value == other)
+
+
+class AttributeIndex:
+    """Index the attributes of all the variables in a dataset.
+
+    The index is built with a single pass over the variables and maps the
+    `(attribute, value)` pairs to the variable names, replacing the
+    `netCDF4.Dataset.get_variables_by_attributes` scans.
+
+    """
+
+    def __init__(self, nc):
+        """Return an AttributeIndex for `nc` (netCDF4.Dataset object)."""
+        # A weak reference, the index is cached with the dataset as its key.
+        self._nc = weakref.ref(nc)
+        self._names = list(nc.variables)
+        self._attrs = {}
+        self._values = {}
+        for name, var in nc.variables.items():
+            for attr in var.ncattrs():
+                value = var.getncattr(attr)
+                self._attrs.setdefault(attr, {})[name] = value
+                if _hashable(value):
+                    self._values.setdefault((attr, value), []).append(name)
+
+    def _match(self, attr, value, candidates):
+        """Return the `candidates` names whose `attr` matches `value`."""
+        variables = self._attrs.get(attr, {})
+        if callable(value):
+            # The callable only sees the candidates with the attribute, and
+            # `None` once for all the candidates without it.
+            names = {
+                name
+                for name in candidates & variables.keys()
+                if value(variables[name])
+            }
+            if value(None):
+                names |= candidates - variables.keys()
+            return names
+        names = set()
+        if _hashable(value):
+            names.update(self._values.get((attr, value), []))
+        names.update(
+            name
+            for name, v in variables.items()
+            if not _hashable(v) and _equal(v, value)
+        )
+        return names & candidates
+
+    def get_variables_by_attributes(self, **kwargs):
+        """Return the variables that match all the attributes in `kwargs`.
+
+        Same semantics as `netCDF4.Dataset.get_variables_by_attributes`:
+        values can be either the attribute value or a callable that takes
+        the attribute value (`None` when absent) and returns True/False.
+
+        The attribute values are looked up in the index first, the callables
+        are then only evaluated for the remaining variables that have the
+        attribute, and once with `None` for the ones without it.
+
+        """
+        nc = self._nc()
+        names = set(self._names)
+        # The indexed values narrow the candidates for the callables.
+        items = sorted(kwargs.items(), key=lambda item: callable(item[1]))
+        for attr, value in items:
+            if attr not in self._attrs and hasattr(netCDF4.Variable, attr):
+                # Python-level properties, like `name` or `dimensions`,
+                # are not netCDF attributes and are not indexed.
+                found = nc.get_variables_by_attributes(**{attr: value})
+                names &= {var.name for var in found}
+            else:
+                names = self._match(attr, value, names)
+            if not names:
+                break
+        return [nc.variables[name] for name in self._names if name in names]
+
+
+def attribute_index(nc, *, refresh=False):
+    """Return the cached AttributeIndex for `nc`, building it if needed.
+
+    Use `refresh=True` to rebuild it after the dataset metadata changes.
+
+    """
+    index = None if refresh else _indexes.get(nc)
+    if index is None:
+        index = _indexes[nc] = AttributeIndex(nc)
+    return index
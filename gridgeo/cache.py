@@ -0,0 +1,287 @@
+"""Persistent on-disk cache of parsed grids."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from gridgeo.polygons import PolygonArray
+
+_MAX_BYTES = 2**30
+
+
+def _attrs(var):
+    return {attr: str(var.getncattr(attr)) for attr in var.ncattrs()}
+
+
+def fingerprint(var):
+    """Return a JSON serializable fingerprint of the dataset structure for
+    `var` (CFVariable): the dimension sizes and the names, dimensions, and
+    attributes of the variable, of its coordinates, and of its UGRID mesh.
+
+    """
+    nc = var._nc  # noqa: SLF001
+    names = [var.name, *var.coordinates.split()]
+    mesh = getattr(nc[var.name], "mesh", None)
+    if mesh:
+        names.append(mesh)
+    return {
+        "dimensions": {name: len(dim) for name, dim in nc.dimensions.items()},
+        "variables": {
+            name: {
+                "dimensions": list(nc[name].dimensions),
+                "attributes": _attrs(nc[name]),
+            }
+            for name in names
+            if name in nc.variables
+        },
+    }
+
+
+def _update(digest, array):
+    """Update the `digest` with the dtype, shape, values, and mask of
+    `array`.
+
+    """
+    data = np.ascontiguousarray(np.ma.getdata(array))
+    digest.update(f"{data.dtype.str}{data.shape}".encode())
+    digest.update(data.tobytes())
+    digest.update(np.packbits(np.ma.getmaskarray(array)).tobytes())
+
+
+def grid_digest(var, bbox=None, *, xy=None):
+    """Return a sha256 hex digest of the grid of `var` (CFVariable): its
+    topology, the values of its coordinates, of the face-node connectivity
+    for UGRID, and the `bbox`.
+
+    xy: the `(x, y)` axes of a structured grid when already read, see
+        `CFVariable.read_axis`
+
+    Datasets with the same digest share the same cells, e.g.: the files of
+    a forecast run, see `GridGeo.from_files`.
+
+    """
+    topology = var.topology()
+    identity = {
+        "topology": topology,
+        "bbox": None if bbox is None else [float(v) for v in bbox],
+    }
+    digest = hashlib.sha256(json.dumps(identity, sort_keys=True).encode())
+    if topology == "ugrid":
+        # Cached on `var`, the grid is then built from the same mesh.
+        mesh = var.ugrid()
+        arrays = [mesh.node_x, mesh.node_y, mesh.faces]
+    else:
+        arrays = list(xy or (var.read_axis("x"), var.read_axis("y")))
+    for array in arrays:
+        _update(digest, array)
+    return digest.hexdigest()
+
+
+def _source(source):
+    """Return the identity of a path, resolved and with its size and
+    modification time, or of a URL.
+
+    """
+    path = Path(source)
+    if not path.exists():
+        return str(source)
+    stat = path.stat()
+    return [str(path.resolve()), stat.st_size, stat.st_mtime_ns]
+
+
+def cache_key(source, selector, var, bbox=None):
+    """Return the cache key, a sha256 hex digest, of a grid.
+
+    source: the file path or URL of the dataset, local files are also
+            identified by their size and modification time
+    selector: the variable selector kwargs of GridGeo, e.g.:
+              `{"standard_name": "sea_water_potential_temperature"}`
+    var: the selected CFVariable, see `fingerprint`
+    bbox: the GridGeo bounding box
+
+    """
+    identity = {
+        "source": _source(source),
+        "selector": {key: str(value) for key, value in selector.items()},
+        "bbox": None if bbox is None else [float(v) for v in bbox],
+        "fingerprint": fingerprint(var),
+    }
+    text = json.dumps(identity, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _write(path, write):
+    """Write a file atomically, `write` takes the open binary file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        Path(tmp).replace(path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class DiskCache:
+    """Store the topology, coordinates, polygons, and outline of parsed grids
+    in `directory`, as npz and WKB files, with a size based LRU eviction.
+
+    The entries are keyed by `cache_key`, use `GridGeo(..., cache=cache)` to
+    read and fill the cache, `invalidate(key)` to drop an entry, and
+    `clear()` to drop all of them. The least recently used entries are
+    evicted when the cache grows over `max_bytes`.
+
+    """
+
+    def __init__(self, directory, max_bytes=_MAX_BYTES):
+        """Return a DiskCache in `directory`, created if needed."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def __repr__(self):
+        """Return repr."""
+        return f"<DiskCache: {self.directory}>"
+
+    def _path(self, key, suffix):
+        return self.directory.joinpath(f"{key}{suffix}")
+
+    def _files(self, key):
+        return [self._path(key, suffix) for suffix in (".npz", ".wkb")]
+
+    def __contains__(self, key):
+        """Return True if there is an entry for `key`."""
+        return self._path(key, ".npz").exists()
+
+    def load(self, key):
+        """Return the entry for `key` as a dict, `None` if missing.
+
+        The entry has the `mesh`, `x`, `y`, `polygons` (PolygonArray),
+        `window`, and `grid_shape`, the `outline` once it was stored, and the
+        UGRID `node_x`, `node_y`, and `faces`, `None` for structured grids.
+
+        """
+        path = self._path(key, ".npz")
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = dict(data)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        # Touch the entry for the LRU eviction.
+        path.touch()
+
+        window = arrays.get("window")
+        entry = {
+            "mesh": str(arrays["mesh"]) or None,
+            "x": np.ma.MaskedArray(arrays["x"], mask=arrays["x_mask"]),
+            "y": np.ma.MaskedArray(arrays["y"], mask=arrays["y_mask"]),
+            "polygons": PolygonArray(
+                arrays["coords"],
+                arrays["offsets"],
+                mask=arrays["mask"],
+                shape=tuple(arrays["shape"]),
+                start=int(arrays["start"]),
+                offset=tuple(arrays["offset"]),
+            ),
+            "window": None
+            if window is None
+            else tuple(slice(int(a), int(b)) for a, b in window),
+            "grid_shape": None
+            if window is None
+            else tuple(int(n) for n in arrays["grid_shape"]),
+            "outline": None,
+            "node_x": arrays.get("node_x"),
+            "node_y": arrays.get("node_y"),
+            "faces": arrays.get("faces"),
+        }
+        wkb = self._path(key, ".wkb")
+        if wkb.exists():
+            entry["outline"] = shapely.from_wkb(wkb.read_bytes())
+        return entry
+
+    def store(self, key, entry):
+        """Store the `mesh`, `x`, `y`, `polygons`, `window`, `grid_shape`,
+        and the optional UGRID `node_x`, `node_y`, and `faces` of a grid, in
+        the `entry` dict, under `key`. See `load`.
+
+        """
+        x, y, polygons = entry["x"], entry["y"], entry["polygons"]
+        arrays = {
+            "mesh": np.array(entry["mesh"] or ""),
+            "x": np.ma.getdata(x),
+            "x_mask": np.ma.getmaskarray(x),
+            "y": np.ma.getdata(y),
+            "y_mask": np.ma.getmaskarray(y),
+            "coords": polygons.coords,
+            "offsets": polygons.offsets,
+            "mask": polygons.mask,
+            "shape": np.array(polygons.shape),
+            "start": np.array(polygons.start),
+            "offset": np.array(polygons.offset),
+        }
+        for name in ("node_x", "node_y", "faces"):
+            if entry.get(name) is not None:
+                arrays[name] = np.ma.getdata(entry[name])
+        if entry.get("window") is not None:
+            arrays["window"] = np.array(
+                [[s.start, s.stop] for s in entry["window"]],
+            )
+            arrays["grid_shape"] = np.array(entry["grid_shape"])
+        _write(self._path(key, ".npz"), lambda f: np.savez(f, **arrays))
+        self._evict(keep=key)
+
+    def store_outline(self, key, outline):
+        """Store the outline of the grid under `key`, as WKB."""
+        if key not in self:
+            return
+        wkb = shapely.to_wkb(outline)
+        _write(self._path(key, ".wkb"), lambda f: f.write(wkb))
+        self._evict(keep=key)
+
+    def invalidate(self, key):
+        """Remove the entry for `key`."""
+        for path in self._files(key):
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        """Remove all the entries."""
+        for path in self.directory.glob("*.npz"):
+            self.invalidate(path.stem)
+
+    @property
+    def nbytes(self):
+        """Return the size of all the entries."""
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            size = sum(
+                p.stat().st_size for p in self._files(path.stem) if p.exists()
+            )
+            entries.append((stat.st_mtime, path.stem, size))
+        return entries
+
+    def _evict(self, keep=None):
+        """Remove the least recently used entries, but `keep`, until the
+        cache fits in `max_bytes`.
+
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, key, size in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.invalidate(key)
+            total -= size
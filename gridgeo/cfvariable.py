@@ -1,8 +1,17 @@
 """CFVariable."""
 
+import functools
+from itertools import pairwise
+
 import numpy as np
 
-from gridgeo.ugrid import ugrid
+from gridgeo.attributes import attribute_index
+from gridgeo.polygons import PolygonArray
+from gridgeo.ugrid import face_cells, ugrid
+
+_BLOCK_ROWS = 256
+# The local dask schedulers, see `gridgeo.dask_netcdf.compute_blocks`.
+SCHEDULERS = ("threads", "processes", "sync")
 
 
 def _make_grid(coords):
@@ -10,6 +19,7 @@ def _make_grid(coords):
     if coords.ndim != ndim:
         msg = f"Expected 3 dimension array, got {coords.ndim}."
         raise ValueError(msg)
+    coords = _filled_masked(coords)
     M, N, L = coords.shape  # noqa: N806
     polygons = np.concatenate(
         (
@@ -20,7 +30,16 @@ def _make_grid(coords):
         ),
         axis=L,
     ).reshape(((M - 1) * (N - 1), 4, L))
-    return [p for p in polygons if not np.isnan(p).any()]
+    # A cell is invalid when any of its 4 nodes has a NaN coordinate.
+    nodes = np.isnan(coords).any(axis=2)
+    invalid = (
+        nodes[0:-1, 0:-1] | nodes[0:-1, 1:] | nodes[1:, 1:] | nodes[1:, 0:-1]
+    )
+    return PolygonArray.from_cells(
+        polygons,
+        mask=~invalid.ravel(),
+        shape=(M - 1, N - 1),
+    )
 
 
 def _filled_masked(arr):
@@ -29,6 +48,163 @@ def _filled_masked(arr):
     return arr
 
 
+def _bbox_cells(cells, bbox):
+    """Return True for the `(..., nvertices, 2)` cells with a bounding box
+    that intersects `bbox`, `(xmin, ymin, xmax, ymax)`.
+
+    """
+    xmin, ymin, xmax, ymax = bbox
+    lower = cells.min(axis=-2)
+    upper = cells.max(axis=-2)
+    return (
+        (upper[..., 0] >= xmin)
+        & (lower[..., 0] <= xmax)
+        & (upper[..., 1] >= ymin)
+        & (lower[..., 1] <= ymax)
+    )
+
+
+def _corners(arr):
+    """Return the 4 corner nodes of each cell of a 2D node array."""
+    return np.stack(
+        [arr[0:-1, 0:-1], arr[0:-1, 1:], arr[1:, 1:], arr[1:, 0:-1]],
+        axis=-1,
+    )
+
+
+def _axis_window(axis, lower, upper):
+    """Return the node slice around the cells of a 1D node `axis` that
+    intersect the `[lower, upper]` interval.
+
+    """
+    axis = _filled_masked(axis)
+    lo = np.minimum(axis[:-1], axis[1:])
+    hi = np.maximum(axis[:-1], axis[1:])
+    found = np.flatnonzero((hi >= lower) & (lo <= upper))
+    if not found.size:
+        return slice(0, 0)
+    return slice(int(found[0]), int(found[-1]) + 2)
+
+
+def _node_coords(x, y):
+    """Return the `(M, N, 2)` node coordinates, NaN where masked, from 1D
+    or 2D `x` and `y` axes.
+
+    """
+    # Some non-compliant grids, like NYHOPS,
+    # may have missing_value/fill_value.
+    x, y = _filled_masked(x), _filled_masked(y)
+    if x.ndim == 1:
+        x, y = np.meshgrid(x, y)
+    return np.stack([x, y], axis=2)
+
+
+def _window_offset(window):
+    """Return the `(row, column)` of the first node of a `window`."""
+    if window is None:
+        return (0, 0)
+    return tuple(s.start or 0 for s in window)
+
+
+def _block_polygons(x, y, bbox=None, start=0, offset=(0, 0)):
+    """Return a PolygonArray with the cells of a block of node rows, only
+    the cells that intersect `bbox` are valid when given.
+
+    """
+    polygons = _make_grid(_node_coords(x, y))
+    mask = polygons.mask
+    if bbox is not None:
+        mask = mask & _bbox_cells(polygons.coords.reshape(-1, 4, 2), bbox)
+    return PolygonArray(
+        polygons.coords,
+        polygons.offsets,
+        mask=mask,
+        shape=polygons.shape,
+        start=start,
+        offset=offset,
+    )
+
+
+def _storage_chunks(variable):
+    """Return the storage chunk sizes of `variable`, `None` if contiguous
+    or already in memory.
+
+    """
+    if not hasattr(variable, "chunking"):
+        return None
+    chunking = variable.chunking()
+    if not chunking or chunking == "contiguous":
+        return None
+    return chunking
+
+
+def _chunk_bounds(variable, block_rows=_BLOCK_ROWS, rows=None):
+    """Return the boundaries of blocks of about `block_rows` rows, within
+    the `rows` slice of `variable`, that line up with its storage chunks.
+
+    """
+    start, stop, _ = (rows or slice(None)).indices(variable.shape[0])
+    step = block_rows
+    chunks = _storage_chunks(variable)
+    if chunks:
+        step = max(chunks[0], block_rows // chunks[0] * chunks[0])
+    first = (start // step + 1) * step
+    return np.array([start, *range(first, stop, step), stop])
+
+
+def iter_chunks(variable, block_rows=_BLOCK_ROWS, rows=None, columns=None):
+    """Yield `(rows, block)` pairs with blocks of about `block_rows` rows of
+    `variable`, only reading the `rows` and `columns` slices when given.
+
+    The block boundaries line up with the storage chunks of the variable,
+    so each compressed chunk is read and decompressed only once.
+
+    """
+    key = () if columns is None else (columns,)
+    bounds = _chunk_bounds(variable, block_rows, rows)
+    for start, stop in pairwise(bounds):
+        block = slice(int(start), int(stop))
+        yield block, variable[(block, *key)]
+
+
+def _ugrid_polygons(node_x, node_y, faces, bbox=None):
+    """Return a PolygonArray with the UGRID `faces`, padded with `-1` in
+    mixed meshes. Faces with less than 3 nodes are invalid.
+
+    """
+    node_x = _filled_masked(node_x)
+    node_y = _filled_masked(node_y)
+    ring_sizes = (faces >= 0).sum(axis=1)
+    min_nodes = 3
+    mask = ring_sizes >= min_nodes
+    if bbox is not None:
+        # Repeating the first node in the padding keeps the bounding box.
+        padded = np.where(faces >= 0, faces, faces[:, :1])
+        cells = np.stack([node_x[padded], node_y[padded]], axis=2)
+        mask &= _bbox_cells(cells, bbox)
+        if not mask.any():
+            msg = f"No grid cells intersect the bbox {bbox}."
+            raise ValueError(msg)
+    if (ring_sizes == faces.shape[1]).all():
+        cells = np.stack([node_x[faces], node_y[faces]], axis=2)
+        return PolygonArray.from_cells(cells, mask=mask)
+    coords, ring_sizes = face_cells(node_x, node_y, faces)
+    return PolygonArray.from_ragged(coords, ring_sizes, mask=mask)
+
+
+def _cached(method):
+    """Cache the result of a CFVariable method until `invalidate()`."""
+
+    @functools.wraps(method)
+    def wrapper(self):
+        name = method.__name__
+        if name not in self._cache:
+            self._cache[name] = method(self)
+        return self._cache[name]
+
+    return wrapper
+
+
 class CFVariable:
     """CFVariable."""
 
@@ -38,7 +214,8 @@ class CFVariable:
 
         """
         self._nc = nc
-        variables = self._nc.get_variables_by_attributes(**kwargs)
+        self._index = attribute_index(nc)
+        variables = self._index.get_variables_by_attributes(**kwargs)
         if len(variables) > 1:
             msg = f"Found more than 1 variable with criteria {kwargs}"
             raise ValueError(msg)
@@ -47,6 +224,16 @@ class CFVariable:
             raise ValueError(msg)
         self._variable = variables[0]
         self._coords = self._variable.coordinates.split()
+        self._cache = {}
+
+    def invalidate(self):
+        """Clear the cached axes and topology and rebuild the attribute index.
+
+        Call it when the dataset metadata changes after initialization.
+
+        """
+        self._cache.clear()
+        self._index = attribute_index(self._nc, refresh=True)
 
     def _filter_coords(self, variables):
         valid_coords = [var for var in variables if var.name in self._coords]
@@ -59,16 +246,17 @@ class CFVariable:
     def axis(self, name):
         return getattr(self, f"{name.lower()}_axis")()
 
+    @_cached
     def t_axis(self):
         tvars = list(
             set(
-                self._nc.get_variables_by_attributes(
+                self._index.get_variables_by_attributes(
                     axis=lambda x: x and str(x).lower() == "t",
                 )
-                + self._nc.get_variables_by_attributes(
+                + self._index.get_variables_by_attributes(
                     standard_name=lambda x: str(x) == "time",
                 )
-                + self._nc.get_variables_by_attributes(
+                + self._index.get_variables_by_attributes(
                     _CoordinateAxisType=lambda x: str(x).lower() == "time",
                 ),
             ),
@@ -76,12 +264,14 @@ class CFVariable:
         # For _CoordinateAxisType: Time
         return self._filter_coords(tvars)
 
+    @_cached
     def crs(self):
         crs = getattr(self._variable, "grid_mapping", None)
         if crs:
             crs = self._nc[crs]
         return crs
 
+    @_cached
     def x_axis(self):
         xnames = ["longitude", "grid_longitude", "projection_x_coordinate"]
         xunits = [
@@ -94,19 +284,20 @@ class CFVariable:
         ]
         xvars = list(
             set(
-                self._nc.get_variables_by_attributes(
+                self._index.get_variables_by_attributes(
                     axis=lambda x: x and str(x).lower() == "x",
                 )
-                + self._nc.get_variables_by_attributes(
+                + self._index.get_variables_by_attributes(
                     standard_name=lambda x: x and str(x).lower() in xnames,
                 )
-                + self._nc.get_variables_by_attributes(
+                + self._index.get_variables_by_attributes(
                     units=lambda x: x and str(x).lower() in xunits,
                 ),
             ),
         )
         return self._filter_coords(xvars)
 
+    @_cached
     def y_axis(self):
         ynames = ["latitude", "grid_latitude", "projection_y_coordinate"]
         yunits = [
@@ -119,19 +310,20 @@ class CFVariable:
         ]
         yvars = list(
             set(
-                self._nc.get_variables_by_attributes(
+                self._index.get_variables_by_attributes(
                     axis=lambda x: x and str(x).lower() == "y",
                 )
-                + self._nc.get_variables_by_attributes(
+                + self._index.get_variables_by_attributes(
                     standard_name=lambda x: x and str(x).lower() in ynames,
                 )
-                + self._nc.get_variables_by_attributes(
+                + self._index.get_variables_by_attributes(
                     units=lambda x: x and str(x).lower() in yunits,
                 ),
             ),
         )
         return self._filter_coords(yvars)
 
+    @_cached
     def z_axis(self):
         znames = [
             "atmosphere_ln_pressure_coordinate",
@@ -148,22 +340,23 @@ class CFVariable:
         ]
         zvars = list(
             set(
-                self._nc.get_variables_by_attributes(
+                self._index.get_variables_by_attributes(
                     axis=lambda x: x and str(x).lower() == "z",
                 )
-                + self._nc.get_variables_by_attributes(
+                + self._index.get_variables_by_attributes(
                     positive=lambda x: x and str(x).lower() in ("up", "down"),
                 )
-                + self._nc.get_variables_by_attributes(
+                + self._index.get_variables_by_attributes(
                     standard_name=lambda x: x and str(x).lower() in znames,
                 ),
             ),
         )
         return self._filter_coords(zvars)
 
+    @_cached
     def topology(self):
         vnames = ["grid_topology", "mesh_topology"]
-        topologies = self._nc.get_variables_by_attributes(
+        topologies = self._index.get_variables_by_attributes(
             cf_role=lambda v: v in vnames,
         )
 
@@ -191,42 +384,251 @@ class CFVariable:
             return "sgrid"
         return None
 
-    def polygons(self):
+    def iter_chunks(self, block_rows=_BLOCK_ROWS, rows=None, columns=None):
+        """Yield `(rows, block)` pairs with blocks of the variable aligned
+        with its storage chunks along the first dimension, see
+        `gridgeo.cfvariable.iter_chunks`.
+
+        """
+        return iter_chunks(self._variable, block_rows, rows, columns)
+
+    def window(self, bbox, block_size=_BLOCK_ROWS, *, xy=None):
+        """Return the `(rows, columns)` node slices around the cells that
+        intersect `bbox`, `(xmin, ymin, xmax, ymax)`, or `None` for UGRID.
+
+        The 1D axes are read whole, the 2D ones are read in blocks of about
+        `block_size` rows, aligned with the storage chunks, and never held
+        in memory at once.
+
+        xy: the full `(x, y)` axes when already read, see `read_axis`
+
+        """
+        xmin, ymin, xmax, ymax = bbox
+        if xmin > xmax or ymin > ymax:
+            msg = f"Expected (xmin, ymin, xmax, ymax), got {bbox}."
+            raise ValueError(msg)
+
+        topology = self.topology()
+        if topology == "ugrid":
+            return None
+
+        x, y = xy or (self.x_axis(), self.y_axis())
+        if topology == "unknown_1d":
+            rows = _axis_window(y[:], ymin, ymax)
+            columns = _axis_window(x[:], xmin, xmax)
+        else:
+            found = np.zeros(x.shape[1] - 1, dtype=bool)
+            first = last = previous = None
+            bounds = _chunk_bounds(x, block_size)
+            for start, stop in pairwise(bounds):
+                nodes = np.stack(
+                    [
+                        _filled_masked(x[start:stop]),
+                        _filled_masked(y[start:stop]),
+                    ],
+                    axis=-1,
+                )
+                # Carry the last row over to close the cells between the
+                # blocks, instead of reading it twice.
+                offset = start
+                if previous is not None:
+                    nodes = np.concatenate([previous, nodes])
+                    offset = start - 1
+                previous = nodes[-1:]
+                cells = np.stack(
+                    [_corners(nodes[..., 0]), _corners(nodes[..., 1])],
+                    axis=-1,
+                )
+                inside = _bbox_cells(cells, bbox)
+                found |= inside.any(axis=0)
+                block = np.flatnonzero(inside.any(axis=1))
+                if block.size:
+                    first = offset + block[0] if first is None else first
+                    last = offset + block[-1]
+            columns = np.flatnonzero(found)
+            if first is None:
+                rows = columns = slice(0, 0)
+            else:
+                rows = slice(int(first), int(last) + 2)
+                columns = slice(int(columns[0]), int(columns[-1]) + 2)
+
+        if rows.stop == rows.start or columns.stop == columns.start:
+            msg = f"No grid cells intersect the bbox {bbox}."
+            raise ValueError(msg)
+        return rows, columns
+
+    def read_axis(self, name, window=None):
+        """Return the `x` or `y` axis coordinates, only reading the
+        `(rows, columns)` node slices in `window` when given. Chunked 2D
+        axes are read in blocks aligned with the storage chunks.
+
+        The node coordinates of UGRID grids are the ones read by the mesh,
+        see `ugrid`.
+
+        """
+        var = self.axis(name)
+        mesh = self.ugrid()
+        if (
+            mesh is not None
+            and var.name in self._nc[mesh.name].node_coordinates.split()
+        ):
+            return mesh.node_x if name.lower() == "x" else mesh.node_y
+        rows, columns = window or (slice(None), slice(None))
+        if var.ndim == 1:
+            return var[columns] if name.lower() == "x" else var[rows]
+        if _storage_chunks(var):
+            return np.ma.concatenate(
+                [
+                    block
+                    for _, block in iter_chunks(
+                        var,
+                        rows=rows,
+                        columns=columns,
+                    )
+                ],
+            )
+        return var[rows, columns]
+
+    @_cached
+    def ugrid(self):
+        """Return the parsed UGridMesh, `None` if the topology is not UGRID.
+
+        The mesh is parsed once and shared by the polygons, triangulation,
+        and outline.
+
+        """
+        if self.topology() != "ugrid":
+            return None
+        return ugrid(self._nc)
+
+    def _read_xy(self, x=None, y=None, window=None):
+        if x is None:
+            x = self.read_axis("x", window)
+        if y is None:
+            y = self.read_axis("y", window)
+        return x, y
+
+    def iter_polygons(
+        self,
+        block_rows=_BLOCK_ROWS,
+        scheduler="threads",
+        bbox=None,
+        window=None,
+    ):
+        """Yield the grid cells as PolygonArray blocks of about `block_rows`
+        cell rows, aligned with the storage chunks, in order, without loading
+        the whole coordinate arrays.
+
+        The coordinates are read through DaskNetCDF and the blocks are built
+        in parallel on a local dask `scheduler`, "threads" or "processes",
+        see `gridgeo.dask_netcdf.compute_blocks`. The blocks know their
+        position in the grid (`PolygonArray.start`), so the writers can
+        stream them to disk. UGRID grids are yielded as a single block.
+
+        """
+        import dask  # noqa: PLC0415
+
+        from gridgeo.dask_netcdf import (  # noqa: PLC0415
+            DaskNetCDF,
+            NetCDFSource,
+            compute_blocks,
+        )
+
         if self.topology() == "ugrid":
-            grid = ugrid(self._nc)
-            node_x = grid["nodes"]["x"]
-            node_y = grid["nodes"]["y"]
-            faces = grid["faces"]
-            return [
-                (list(zip(node_x[k], node_y[k], strict=False))) for k in faces
-            ]
-
-        if self.topology() == "sgrid":
-            x, y = self.x_axis()[:], self.y_axis()[:]
-            coords = np.concatenate([x[..., None], y[..., None]], axis=2)
-            return _make_grid(coords)
-
-        if self.topology() == "unknown_1d":
-            x, y = self.x_axis()[:], self.y_axis()[:]
-            # Some non-compliant grids, like NYHOPS,
-            # may have missing_value/fill_value.
-            x = _filled_masked(x)
-            y = _filled_masked(y)
-            if hasattr(y, "filled"):
-                y = y.filled(fill_value=np.nan)
-            x, y = np.meshgrid(x, y)
-            coords = np.stack([x, y], axis=2)
-            return _make_grid(coords)
-
-        if self.topology() == "unknown_2d":
-            x, y = self.x_axis()[:], self.y_axis()[:]
-            # Some non-compliant grids, like NYHOPS,
-            # may have missing_value/fill_value.
-            x = _filled_masked(x)
-            y = _filled_masked(y)
-            coords = np.concatenate([x[..., None], y[..., None]], axis=2)
-            return _make_grid(coords)
-        return None
+            yield self.polygons(bbox=bbox)
+            return
+
+        if bbox is not None and window is None:
+            window = self.window(bbox)
+        rows, columns = window or (slice(None), slice(None))
+        xvar, yvar = self.x_axis(), self.y_axis()
+        sources = [NetCDFSource.from_variable(var) for var in (xvar, yvar)]
+        if scheduler == "processes" and not all(
+            isinstance(source, NetCDFSource) for source in sources
+        ):
+            msg = (
+                "In-memory datasets cannot be sent to other processes, use "
+                'the "threads" or "sync" scheduler.'
+            )
+            raise ValueError(msg)
+        x, y = (DaskNetCDF(source).array for source in sources)
+        if x.ndim == 1:
+            x = x[columns]
+        else:
+            x, y = x[:, columns], y[:, columns]
+        # Blocks of whole storage chunks, the last row of a block also
+        # closes the cells of the previous one.
+        bounds = _chunk_bounds(yvar, block_rows, rows)
+        if bounds.size > 2 and bounds[-1] - bounds[-2] == 1:  # noqa: PLR2004
+            bounds = np.delete(bounds, -2)
+        stop = bounds[-1]
+        ncells = x.shape[-1] - 1
+        tasks = []
+        for first, last in pairwise(bounds):
+            block = slice(int(first), int(min(last + 1, stop)))
+            tasks.append(
+                dask.delayed(_block_polygons)(
+                    x if x.ndim == 1 else x[block],
+                    y[block],
+                    bbox=bbox,
+                    start=(first - bounds[0]) * ncells,
+                    offset=_window_offset(window),
+                ),
+            )
+        yield from compute_blocks(tasks, scheduler=scheduler)
+
+    def polygons(  # noqa: PLR0913
+        self,
+        x=None,
+        y=None,
+        bbox=None,
+        window=None,
+        *,
+        block_rows=None,
+        scheduler="threads",
+    ):
+        """Return the grid cells as a PolygonArray.
+
+        x, y: the already read `x_axis()[:]` and `y_axis()[:]` arrays,
+              to avoid reading the coordinates again.
+        bbox: `(xmin, ymin, xmax, ymax)`, only the cells that intersect it
+              are valid. Structured grids only read the coordinates in the
+              node `window` around them, see `CFVariable.window`, and
+              UGRID grids mask the faces outside of it.
+        block_rows, scheduler: build the cells in blocks of rows with dask,
+                               see `CFVariable.iter_polygons`
+
+        """
+        topology = self.topology()
+        if topology == "ugrid":
+            mesh = self.ugrid()
+            return _ugrid_polygons(
+                mesh.node_x,
+                mesh.node_y,
+                mesh.faces,
+                bbox=bbox,
+            )
+
+        if topology not in ("sgrid", "unknown_1d", "unknown_2d"):
+            return None
+
+        if block_rows and (x is None or y is None):
+            return PolygonArray.concatenate(
+                self.iter_polygons(
+                    block_rows=block_rows,
+                    scheduler=scheduler,
+                    bbox=bbox,
+                    window=window,
+                ),
+            )
+
+        if bbox is not None and window is None and (x is None or y is None):
+            window = self.window(bbox)
+        return _block_polygons(
+            *self._read_xy(x, y, window),
+            bbox=bbox,
+            offset=_window_offset(window),
+        )
 
     # Replication of the `netCDF4.Variable` object via composition.
     def __getitem__(self, key):
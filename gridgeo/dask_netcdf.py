@@ -1,18 +1,115 @@
+import os
+
 import dask
 import dask.array as da
-from dask.local import get_sync
+import netCDF4
+import numpy as np
+from dask.utils import SerializableLock
+
+from gridgeo.cfvariable import SCHEDULERS
+from gridgeo.gridgeo import _filepath
+
+# netCDF-C/HDF5 are not thread-safe, all the reads are serialized.
+_LOCK = SerializableLock()
+
+
+class NetCDFSource:
+    """Read-only view of a netCDF variable that re-opens the file on each
+    read, so it can be pickled and sent to the processes scheduler.
+
+    """
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        with netCDF4.Dataset(path) as nc:
+            var = nc[name]
+            self.shape = var.shape
+            self.dtype = var.dtype
+            self._chunking = var.chunking()
+        self.ndim = len(self.shape)
+
+    @classmethod
+    def from_variable(cls, variable):
+        """Return a NetCDFSource for `variable`, or the variable itself when
+        its dataset has no path, e.g.: in-memory datasets.
+
+        """
+        path = _filepath(variable.group())
+        if path is None:
+            return variable
+        return cls(path, variable.name)
+
+    def chunking(self):
+        return self._chunking
+
+    def __getitem__(self, key):
+        with _LOCK, netCDF4.Dataset(self.path) as nc:
+            return nc[self.name][key]
+
+    def __repr__(self):
+        return f"<NetCDFSource: {self.name} in {self.path}>"
+
+
+def native_chunks(variable):
+    """Return dask chunks for `variable` that are whole multiples of its
+    netCDF4/HDF5 storage chunks, or "auto" for contiguous variables.
+
+    """
+    chunking = variable.chunking()
+    if not chunking or chunking == "contiguous":
+        return "auto"
+    return da.core.normalize_chunks(
+        "auto",
+        shape=variable.shape,
+        dtype=variable.dtype,
+        previous_chunks=tuple(chunking),
+    )
+
+
+def _unwrap(obj):
+    if isinstance(obj, DaskNetCDF):
+        return obj.array
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_unwrap(item) for item in obj)
+    return obj
+
+
+class DaskNetCDF(np.lib.mixins.NDArrayOperatorsMixin):
+    """Lazy, dask backed, view of a netCDF variable.
+
+    Indexing, the NumPy ufuncs and operators, the NumPy functions, and the
+    reductions return new lazy DaskNetCDF objects, use `compute()` to read
+    the data as a masked array, or `np.asarray` to read it with NaN for the
+    masked values.
 
-dask.set_options(get=get_sync)
+    chunks: dask chunks, by default aligned with the storage chunks of the
+            variable, see `native_chunks`
 
+    """
 
-class DaskNetCDF:
     def __init__(self, variable, array=None, chunks=None):
         self._variable = variable
-        self.chunks = chunks or -1
         if array is None:
-            self.array = da.from_array(variable, chunks=chunks)
-        else:
-            self.array = array
+            chunks = chunks or native_chunks(variable)
+            # NetCDFSource takes the lock itself.
+            lock = False if isinstance(variable, NetCDFSource) else _LOCK
+            # Keep the masked arrays returned by netCDF4.
+            array = da.from_array(
+                variable,
+                chunks=chunks,
+                asarray=False,
+                lock=lock,
+            )
+        self.array = array
+        self.chunks = array.chunks
+
+    def _wrap(self, result):
+        if isinstance(result, da.Array):
+            return DaskNetCDF(variable=self._variable, array=result)
+        if isinstance(result, (list, tuple)):
+            return type(result)(self._wrap(item) for item in result)
+        return result
 
     def __repr__(self):
         lines = self._variable.__repr__().split("\n")
@@ -35,41 +132,80 @@ class DaskNetCDF:
     def shape(self):
         return self.array.shape
 
+    @property
+    def ndim(self):
+        return self.array.ndim
+
+    @property
+    def size(self):
+        return self.array.size
+
+    def __len__(self):
+        return len(self.array)
+
     def transpose(self, *axes):
-        new_array = self.array.transpose(*axes)
-        return DaskNetCDF(
-            variable=self._variable,
-            array=new_array,
-            chunks=self.chunks,
-        )
+        return self._wrap(self.array.transpose(*axes))
 
     @property
     def T(self):
         return self.transpose()
 
     def __getitem__(self, index):
-        return self.array.__getitem__(index).compute()
-
-    def __add__(self, other):
-        new_array = self.array.__add__(other)
-        return DaskNetCDF(
-            variable=self._variable,
-            array=new_array,
-            chunks=self.chunks,
-        )
+        return self._wrap(self.array[_unwrap(index)])
 
-    def __sub__(self, other):
-        new_array = self.array.__sub__(other)
-        return DaskNetCDF(
-            variable=self._variable,
-            array=new_array,
-            chunks=self.chunks,
-        )
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        kwargs = {key: _unwrap(value) for key, value in kwargs.items()}
+        result = getattr(ufunc, method)(*_unwrap(inputs), **kwargs)
+        return self._wrap(result)
+
+    def __array_function__(self, func, types, args, kwargs):
+        kwargs = {key: _unwrap(value) for key, value in kwargs.items()}
+        return self._wrap(func(*_unwrap(args), **kwargs))
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.compute()
+        if np.ma.is_masked(data):
+            # The masked values become NaN, integers are cast to float.
+            if data.dtype.kind not in "fc":
+                data = data.astype(np.float64)
+            data = data.filled(np.nan)
+        return np.asarray(np.ma.getdata(data), dtype=dtype)
+
+    def compute(self, **kwargs):
+        """Return the data, `kwargs` are passed to dask's compute."""
+        return self.array.compute(**kwargs)
+
+    def min(self, axis=None, **kwargs):
+        return self._wrap(self.array.min(axis=axis, **kwargs))
+
+    def max(self, axis=None, **kwargs):
+        return self._wrap(self.array.max(axis=axis, **kwargs))
+
+    def mean(self, axis=None, **kwargs):
+        return self._wrap(self.array.mean(axis=axis, **kwargs))
+
+    def sum(self, axis=None, **kwargs):
+        return self._wrap(self.array.sum(axis=axis, **kwargs))
 
     def astype(self, dtype, **kwargs):
-        new_array = self.array.astype(dtype, **kwargs)
-        return DaskNetCDF(
-            variable=self._variable,
-            array=new_array,
-            chunks=self.chunks,
+        return self._wrap(self.array.astype(dtype, **kwargs))
+
+
+def compute_blocks(tasks, scheduler="threads", num_workers=None):
+    """Compute the dask.delayed `tasks` on a local `scheduler`, "threads",
+    "processes", or "sync", and yield the results in order.
+
+    Only `num_workers` tasks (default: the number of CPUs) are computed at a
+    time, so the results can be streamed without holding all of them.
+
+    """
+    if scheduler not in SCHEDULERS:
+        msg = f"Expected one of {SCHEDULERS}, got {scheduler}."
+        raise ValueError(msg)
+    num_workers = num_workers or os.cpu_count() or 1
+    for start in range(0, len(tasks), num_workers):
+        yield from dask.compute(
+            *tasks[start : start + num_workers],
+            scheduler=scheduler,
+            num_workers=num_workers,
         )
@@ -0,0 +1,149 @@
+"""In-process memoized GridGeo factory."""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import netCDF4
+
+from gridgeo.gridgeo import GridGeo, _filepath
+
+_MAX_ENTRIES = 32
+_MAX_BYTES = 2**30
+
+
+def _key(nc, kwargs):
+    """Return the hashable key of a dataset and the GridGeo `kwargs`."""
+    if isinstance(nc, netCDF4.Dataset):
+        # In-memory datasets are only equal to themselves.
+        source = _filepath(nc) or id(nc)
+    else:
+        source = str(nc)
+    return source, tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+
+
+class GridCache:
+    """Bounded in-memory LRU of GridGeo objects keyed by dataset and kwargs.
+
+    The least recently used grids are evicted when there are more than
+    `max_entries` of them, or when their estimated size (`GridGeo.nbytes`)
+    is over `max_bytes`. The sizes are estimated again on every `get`, hits
+    included, as the cells, tree, outline, etc. of the cached grids are
+    built after their insertion. Concurrent `get` calls for the same key
+    share a single build.
+
+    """
+
+    def __init__(self, max_entries=_MAX_ENTRIES, max_bytes=_MAX_BYTES):
+        """Return an empty GridCache."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._grids = OrderedDict()
+        self._building = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        """Return repr."""
+        return f"<GridCache: {len(self)} grids>"
+
+    def __len__(self):
+        """Return the number of cached grids."""
+        return len(self._grids)
+
+    def __contains__(self, key):
+        """Return True if the grid for `key` is cached."""
+        return key in self._grids
+
+    @property
+    def nbytes(self):
+        """Return the estimated size of the cached grids."""
+        return sum(grid.nbytes for grid in self._grids.values())
+
+    def stats(self):
+        """Return the hit, miss, shared build, and eviction counters, and
+        the current number of entries and size.
+
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "evictions": self.evictions,
+                "entries": len(self._grids),
+                "nbytes": self.nbytes,
+            }
+
+    def get(self, nc, **kwargs):
+        """Return the cached GridGeo for `nc` and `kwargs`, building it with
+        `GridGeo(nc, **kwargs)` on a miss.
+
+        """
+        key = _key(nc, kwargs)
+        with self._lock:
+            if key in self._grids:
+                self._grids.move_to_end(key)
+                self.hits += 1
+                self._evict()
+                return self._grids[key]
+            future = self._building.get(key)
+            if future is None:
+                future = self._building[key] = Future()
+                self.misses += 1
+                build = True
+            else:
+                self.shared += 1
+                build = False
+
+        if not build:
+            return future.result()
+
+        try:
+            grid = GridGeo(nc, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                del self._building[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._building[key]
+            self._grids[key] = grid
+            self._evict()
+        future.set_result(grid)
+        return grid
+
+    def _evict(self):
+        """Remove the least recently used grids, but the newest one, until
+        the cache fits in `max_entries` and `max_bytes`.
+
+        """
+        while len(self._grids) > 1 and (
+            len(self._grids) > self.max_entries or self.nbytes > self.max_bytes
+        ):
+            self._grids.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all the grids and reset the counters."""
+        with self._lock:
+            self._grids.clear()
+            self.hits = self.misses = self.shared = self.evictions = 0
+
+
+grid_cache = GridCache()
+
+
+def get_grid(nc, **kwargs):
+    """Return a GridGeo for `nc` and `kwargs` from the process wide
+    `grid_cache`, building it only once.
+
+    Same arguments as GridGeo, the grids are shared so they should not be
+    modified.
+
+    """
+    return grid_cache.get(nc, **kwargs)
@@ -1,15 +1,34 @@
 """GridGeo: make geo-representation of ocean models grids."""
 
-from copy import copy
-from itertools import zip_longest
+from itertools import chain
 from pathlib import Path
 
 import netCDF4
-from shapely.geometry import MultiPolygon
-from shapely.ops import unary_union
-
-from gridgeo.cfvariable import CFVariable
-from gridgeo.ugrid import ugrid
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+from gridgeo.cache import cache_key, grid_digest
+from gridgeo.cfvariable import SCHEDULERS, CFVariable, _filled_masked
+from gridgeo.locate import CellTree, kdtree_locate, searchsorted_locate
+from gridgeo.outline import (
+    boundary_edges,
+    parallel_union,
+    polygonize_boundary,
+    structured_boundary,
+    union_outline,
+)
+from gridgeo.polygons import PolygonArray
+from gridgeo.ugrid import triangulate
+from gridgeo.writers import (
+    _round,
+    iter_features,
+    iter_rings,
+    to_arrow,
+    write_geojson,
+    write_parquet,
+    write_records,
+)
 
 try:
     from matplotlib import tri
@@ -19,6 +38,8 @@ except ImportError:
 
 def set_precision(coords, precision):
     """Set precision for the coords."""
+    if isinstance(coords, np.ndarray):
+        return _round(coords, precision).tolist()
     result = []
     try:
         return round(coords, int(precision))
@@ -28,47 +49,580 @@ def set_precision(coords, precision):
     return result
 
 
+def _cell_geometries(polygons):
+    """Return an array of shapely Polygons, one per grid cell.
+
+    Cells with the same number of vertices are stacked into a single
+    `(ncells, nvertices, 2)` array and built in one call to shapely's
+    vectorized constructor.
+
+    """
+    if isinstance(polygons, PolygonArray):
+        return polygons.to_shapely()
+    ndim = 3
+    try:
+        coords = np.asarray(polygons, dtype=float)
+    except ValueError:
+        # Ragged cells, e.g.: mixed triangles and quads.
+        coords = None
+    if coords is not None and coords.ndim == ndim:
+        return shapely.polygons(coords)
+    return np.array([Polygon(p) for p in polygons], dtype=object)
+
+
+def _filepath(nc):
+    """Return the path or URL of `nc`, `None` for in-memory datasets."""
+    try:
+        path = nc.filepath()
+    except ValueError:
+        return None
+    # Diskless and `memory=` datasets return the name they were opened with.
+    if "://" not in path and not Path(path).is_file():
+        return None
+    return path
+
+
+def _window_axes(x, y, window):
+    """Return the full `x` and `y` axes cut to the `(rows, columns)` node
+    slices of `window`, like `CFVariable.read_axis`.
+
+    """
+    if window is None:
+        return x, y
+    rows, columns = window
+    if np.ndim(x) == 1:
+        return x[columns], y[rows]
+    return x[rows, columns], y[rows, columns]
+
+
+def _cell_shape(x, y):
+    """Return the shape of the cell grid of the full `x` and `y` node axes,
+    arrays or netCDF variables.
+
+    """
+    if len(x.shape) == 1:
+        return (y.shape[0] - 1, x.shape[0] - 1)
+    return (x.shape[0] - 1, x.shape[1] - 1)
+
+
+def _window_columns(columns, window, grid_shape):
+    """Return the cells of `window` in the `grid_shape` shaped `columns`,
+    the other columns are returned as is.
+
+    """
+    if not columns or window is None:
+        return columns
+    rows, cols = window
+    cells = (
+        slice(rows.start, rows.stop - 1),
+        slice(cols.start, cols.stop - 1),
+    )
+    return {
+        name: values[cells] if np.shape(values) == grid_shape else values
+        for name, values in columns.items()
+    }
+
+
+def _block_columns(columns, block):
+    """Return the rows of the cell grid shaped `columns` in `block`."""
+    if not columns:
+        return columns
+    ndim = 2
+    if len(block.shape) != ndim:
+        return columns
+    start = block.start // block.shape[1]
+    rows = slice(start, start + block.shape[0])
+    return {name: np.asarray(values)[rows] for name, values in columns.items()}
+
+
+# Estimated bytes per object, on top of their coordinates: per shapely cell
+# or multipolygon part, per STRtree and KD-tree entry, and per coordinate of
+# the nested `__geo_interface__` tuples.
+_OBJECT_BYTES = {
+    "cells": 640,
+    "geometry": 160,
+    "tree": 64,
+    "kdtree": 48,
+    "geo_interface": 180,
+}
+
+
+# The grid attributes shared by the GridGeo objects of the same grid.
+_SHARED = (
+    "_window",
+    "_grid_shape",
+    "_x",
+    "_y",
+    "_polygons",
+    "_triang",
+    "_topology",
+    "_geo_interface",
+    "_outline",
+    "_geometry",
+    "_cells",
+    "_tree",
+    "_kdtree",
+)
+
+
 class GridGeo:
     """GridGeo class takes a nc-like object (netCDF4-python or a netCDF
     file/URL) and parse the grid information.
 
     """
 
-    def __init__(self, nc, **kwargs):
+    def __init__(  # noqa: PLR0913
+        self,
+        nc,
+        *,
+        lazy=False,
+        bbox=None,
+        block_rows=None,
+        scheduler="threads",
+        cache=None,
+        **kwargs,
+    ):
         """Return a GridGeo class.
 
         nc: netCDF4-python object or a netCDF file/URL string
+        lazy: only detect the grid topology at initialization and load the
+              coordinates, polygons, and triangulation on first access
+        bbox: `(xmin, ymin, xmax, ymax)`, subset the grid to the cells that
+              intersect it. Structured grids only read the coordinates in
+              `GridGeo.window` and UGRID grids mask the other faces
+        block_rows: out-of-core mode, build the cells in blocks of
+                    `block_rows` rows with dask, see
+                    `CFVariable.iter_polygons`, and stream them in `save`.
+                    Implies `lazy=True`
+        scheduler: the local dask scheduler, "threads", "processes", or
+                   "sync". In-memory datasets cannot use "processes"
+        cache: a `gridgeo.cache.DiskCache` to read the coordinates, polygons,
+               and outline from, and to store them in when missing. Only
+               used for datasets with a path or URL
 
         """
+        if scheduler not in SCHEDULERS:
+            msg = f"Expected one of {SCHEDULERS}, got {scheduler}."
+            raise ValueError(msg)
+        source = nc
         if isinstance(nc, netCDF4.Dataset):
-            pass
+            source = _filepath(nc)
         else:
             nc = netCDF4.Dataset(nc)
 
-        var = CFVariable(nc, **kwargs)
-
-        self.x = var.x_axis()[:]
-        self.y = var.y_axis()[:]
-        self.mesh = var.topology()
-        self.polygons = var.polygons()
+        self._nc = nc
+        self._source = source
+        self._selector = kwargs
+        self._var = CFVariable(nc, **kwargs)
+        self.mesh = self._var.topology()
+        self.bbox = None if bbox is None else tuple(bbox)
+        self._window = None
+        self._grid_shape = None
+        self.block_rows = block_rows
+        self.scheduler = scheduler
+        self._x = None
+        self._y = None
+        self._polygons = None
+        self._triang = None
+        self._topology = None
         self._geo_interface = None
         self._outline = None
         self._geometry = None
+        self._cells = None
+        self._tree = None
+        self._kdtree = None
+        self._cache = None
+        self.cache_key = None
+        if cache is not None and source is not None:
+            self._cache = cache
+            self.cache_key = cache_key(source, kwargs, self._var, self.bbox)
+            self._restore(cache.load(self.cache_key))
+
+        if not (lazy or block_rows):
+            self.load()
+
+    @classmethod
+    def from_files(cls, paths, **kwargs):
+        """Return a GridGeo for each of the netCDF files/URLs in `paths`,
+        e.g.: the files of a forecast run.
+
+        The grids are identified by `gridgeo.cache.grid_digest`, the hash of
+        their coordinates, and the coordinates, polygons, triangulation, and
+        outline are only built once for each distinct grid. The other files
+        get lightweight GridGeo objects that share them and only keep their
+        own dataset and variable.
+
+        The coordinates are read once for each file, the digest of the
+        first file of a grid, its `bbox` window, and its cells use the same
+        arrays. The datasets
+        are closed once their grid is built or shared, so only one file is
+        open at a time, and opened again when needed, see
+        `GridGeo.variable`.
+
+        kwargs: passed to GridGeo, e.g.: the variable selector and `bbox`,
+                `lazy` is not supported
+
+        """
+        if "lazy" in kwargs:
+            msg = "from_files builds the grids, lazy is not supported."
+            raise TypeError(msg)
+        grids, built = [], {}
+        for path in paths:
+            grid = cls(path, lazy=True, **kwargs)
+            var, xy = grid.variable, None
+            if grid.mesh != "ugrid":
+                xy = var.read_axis("x"), var.read_axis("y")
+            digest = grid_digest(var, grid.bbox, xy=xy)
+            if digest in built:
+                grid._share(built[digest])
+            else:
+                if xy is not None:
+                    if grid.bbox is not None:
+                        grid._window = var.window(grid.bbox, xy=xy)
+                        grid._grid_shape = _cell_shape(*xy)
+                    grid._x, grid._y = _window_axes(*xy, grid.window)
+                grid.load()
+                _ = grid.outline
+                built[digest] = grid
+            grid.close()
+            grids.append(grid)
+        return grids
+
+    def _share(self, other):
+        """Share the coordinates, cells, and derived objects of `other`, a
+        GridGeo of the same grid.
+
+        """
+        self.mesh = other.mesh
+        for name in _SHARED:
+            setattr(self, name, getattr(other, name))
+
+    def _restore(self, entry):
+        """Restore the coordinates, polygons, and outline of a cache entry."""
+        if entry is None:
+            return
+        self.mesh = entry["mesh"]
+        self._window = entry["window"]
+        self._grid_shape = entry["grid_shape"]
+        self._x = entry["x"]
+        self._y = entry["y"]
+        self._polygons = entry["polygons"]
+        self._outline = entry["outline"]
+        if entry.get("faces") is not None:
+            self._topology = (entry["node_x"], entry["node_y"], entry["faces"])
+
+    def load(self):
+        """Load the coordinates, polygons, and triangulation."""
+        _ = self.x, self.y, self.polygons, self.triang
+        return self
 
-        if self.mesh == "ugrid" and tri:
-            grid = ugrid(nc)
-            node_x = grid["nodes"]["x"]
-            node_y = grid["nodes"]["y"]
-            faces = grid["faces"]
-            self.triang = tri.Triangulation(node_x, node_y, triangles=faces)
+    @property
+    def variable(self):
+        """Return the CFVariable used to parse the grid, the dataset is
+        opened again after `close()`, except for in-memory datasets.
+
+        """
+        if self._var is None:
+            if self._source is None:
+                msg = "The in-memory dataset is closed, it cannot be opened."
+                raise ValueError(msg)
+            self._nc = netCDF4.Dataset(self._source)
+            self._var = CFVariable(self._nc, **self._selector)
+        return self._var
+
+    def close(self):
+        """Close the dataset, the loaded grid is kept and the dataset is
+        opened again when needed, see `variable`. In-memory and diskless
+        datasets cannot be opened again.
+
+        """
+        if self._nc.isopen():
+            self._nc.close()
+        self._var = None
+
+    @property
+    def nbytes(self):
+        """Return the estimated memory used by the loaded arrays and the
+        derived objects: cells, geometry, tree, outline, triangulation,
+        KD-tree, and `__geo_interface__`.
+
+        The shapely, scipy, and Python objects are counted as their
+        coordinates plus a fixed size per object, see `_OBJECT_BYTES`.
+
+        """
+        arrays = [self._x, self._y]
+        if self._topology is not None:
+            arrays.extend(self._topology)
+        if self._triang is not None:
+            triang = self._triang
+            arrays.extend([triang.x, triang.y, triang.triangles, triang.mask])
+        nbytes = sum(np.asarray(a).nbytes for a in arrays if a is not None)
+        if self._kdtree is not None:
+            nbytes += self._kdtree.nbytes
+
+        polygons = self._polygons
+        if polygons is not None:
+            coords = polygons.coords.nbytes
+            nbytes += coords + polygons.offsets.nbytes + polygons.mask.nbytes
+            ncells, npoints = len(polygons), len(polygons.coords)
+            derived = {
+                "cells": (self._cells, coords, ncells),
+                "geometry": (self._geometry, coords, ncells),
+                "tree": (self._tree, 0, ncells),
+                "kdtree": (self._kdtree, 0, ncells),
+                "geo_interface": (self._geo_interface, 0, npoints),
+            }
+            for name, (obj, size, count) in derived.items():
+                if obj is not None:
+                    nbytes += size + count * _OBJECT_BYTES[name]
+        if self._outline is not None:
+            nbytes += _OBJECT_BYTES["cells"] + 16 * int(
+                shapely.get_num_coordinates(self._outline),
+            )
+        return nbytes
+
+    @property
+    def window(self):
+        """Return the `(rows, columns)` node slices read for `bbox`.
+
+        `None` without a `bbox` and for UGRID. `cell_mask` only covers the
+        cells of the window, the indices returned by `locate` and exported
+        per cell are in the full grid, see `grid_shape`.
+
+        """
+        if self._window is None and self.bbox is not None:
+            if self.mesh == "ugrid":
+                return None
+            var = self.variable
+            self._window = var.window(self.bbox)
+            self._grid_shape = _cell_shape(var.x_axis(), var.y_axis())
+        return self._window
+
+    @property
+    def grid_shape(self):
+        """Return the shape of the full cell grid, `cell_mask.shape` unless
+        `bbox` selects a window of a structured grid.
+
+        """
+        if self.window is None:
+            return self.cell_mask.shape
+        return self._grid_shape
+
+    @property
+    def x(self):
+        """Return the x-axis coordinates."""
+        if self._x is None:
+            self._x = self.variable.read_axis("x", self.window)
+        return self._x
+
+    @property
+    def y(self):
+        """Return the y-axis coordinates."""
+        if self._y is None:
+            self._y = self.variable.read_axis("y", self.window)
+        return self._y
+
+    @property
+    def polygons(self):
+        """Return the grid cells as a PolygonArray."""
+        if self._polygons is None:
+            if self._cache is not None or not self.block_rows:
+                # Read the axes once, for the polygons, `x` and `y`, and the
+                # cache entry.
+                _ = self.x, self.y
+            self._polygons = self.variable.polygons(
+                x=self._x,
+                y=self._y,
+                bbox=self.bbox,
+                window=self.window,
+                block_rows=self.block_rows,
+                scheduler=self.scheduler,
+            )
+            if self._cache is not None:
+                entry = {
+                    "mesh": self.mesh,
+                    "x": self._x,
+                    "y": self._y,
+                    "polygons": self._polygons,
+                    "window": self.window,
+                    "grid_shape": self._grid_shape,
+                }
+                if self.mesh == "ugrid":
+                    node_x, node_y, faces = self._mesh_arrays()
+                    entry.update(node_x=node_x, node_y=node_y, faces=faces)
+                self._cache.store(self.cache_key, entry)
+        return self._polygons
+
+    def _mesh_arrays(self):
+        """Return the UGRID node coordinates and face-node connectivity, from
+        the cache entry when restored.
+
+        """
+        if self._topology is None:
+            mesh = self.variable.ugrid()
+            return mesh.node_x, mesh.node_y, mesh.faces
+        return self._topology
+
+    def _blocks(self):
+        """Return the loaded polygons or, in the out-of-core mode, stream
+        them in blocks of rows.
+
+        """
+        if self._polygons is not None or not self.block_rows:
+            return self.polygons
+        return self.variable.iter_polygons(
+            block_rows=self.block_rows,
+            scheduler=self.scheduler,
+            bbox=self.bbox,
+            window=self.window,
+        )
+
+    @property
+    def triang(self):
+        """Return a matplotlib Triangulation for UGRID grids."""
+        if self._triang is None and self.mesh == "ugrid" and tri:
+            node_x, node_y, faces = self._mesh_arrays()
+            # Mixed meshes are split into triangles.
+            triangles, index = triangulate(faces)
+            mask = None if self.bbox is None else ~self.cell_mask[index]
+            self._triang = tri.Triangulation(
+                node_x,
+                node_y,
+                triangles=triangles,
+                mask=mask,
+            )
+        return self._triang
 
     @property
     def geometry(self):
         """Return grid geometry."""
         if self._geometry is None:
-            self._geometry = MultiPolygon(list(zip_longest(self.polygons, [])))
+            self._geometry = shapely.multipolygons(self.cells)
         return self._geometry
 
+    @property
+    def cells(self):
+        """Return an array with a shapely Polygon for each valid cell."""
+        if self._cells is None:
+            self._cells = _cell_geometries(self.polygons)
+        return self._cells
+
+    @property
+    def tree(self):
+        """Return a shapely STRtree over the valid cells."""
+        if self._tree is None:
+            self._tree = shapely.STRtree(self.cells)
+        return self._tree
+
+    def locate(self, lon, lat, engine="auto"):
+        """Return the index of the cell containing each `(lon, lat)` point.
+
+        The indices are flat indices into the full cell grid, use
+        `np.unravel_index(index, grid.grid_shape)` to get the (j, i)
+        indices of structured grids, and -1 marks points outside the grid.
+        Points on a shared edge get the lowest cell index.
+
+        engine: "strtree" queries an STRtree of the cell polygons,
+                "searchsorted" bisects the 1D axes of unknown_1d grids,
+                "kdtree" checks the cells around the nearest centers
+                (requires scipy, not for mixed meshes), and "auto" picks
+                "searchsorted" for unknown_1d grids without NaNs,
+                "kdtree" when available, and "strtree" otherwise
+
+        """
+        engines = ["auto", "strtree", "searchsorted", "kdtree"]
+        if engine not in engines:
+            msg = f"Expected one of {engines}, got {engine}."
+            raise ValueError(msg)
+        if engine == "auto":
+            engine = self._locate_engine()
+
+        lon, lat = np.broadcast_arrays(lon, lat)
+        shape = lon.shape
+        lon, lat = lon.ravel(), lat.ravel()
+        if engine == "searchsorted":
+            if self.mesh != "unknown_1d":
+                msg = (
+                    "The searchsorted engine requires the 1D axes of an "
+                    f"unknown_1d grid, got {self.mesh}."
+                )
+                raise ValueError(msg)
+            x, y = _filled_masked(self.x), _filled_masked(self.y)
+            index = searchsorted_locate(x, y, self.cell_mask, lon, lat)
+        elif engine == "kdtree":
+            if self.polygons.nvertices is None:
+                msg = (
+                    "The kdtree engine requires cells with the same number "
+                    "of vertices, use the strtree engine for mixed meshes."
+                )
+                raise ValueError(msg)
+            index = kdtree_locate(self.kdtree, lon, lat)
+        else:
+            index = self._strtree_locate(lon, lat)
+        if self.window is not None:
+            index = self._grid_index(index)
+        return index.reshape(shape)
+
+    def _grid_index(self, index):
+        """Return the flat `index` of window cells in the full cell grid."""
+        found = index >= 0
+        j, i = np.unravel_index(index[found], self.cell_mask.shape)
+        rows, columns = self.polygons.offset
+        index = index.copy()
+        index[found] = np.ravel_multi_index(
+            (j + rows, i + columns),
+            self.grid_shape,
+        )
+        return index
+
+    def _locate_engine(self):
+        if self.mesh == "unknown_1d":
+            x, y = _filled_masked(self.x), _filled_masked(self.y)
+            if not (np.isnan(x).any() or np.isnan(y).any()):
+                return "searchsorted"
+        if self.polygons.nvertices is None:
+            return "strtree"
+        try:
+            self.kdtree  # noqa: B018
+        except ImportError:
+            return "strtree"
+        return "kdtree"
+
+    @property
+    def kdtree(self):
+        """Return the CellTree, scipy KD-trees over the valid cell centers,
+        see `gridgeo.locate.CellTree`.
+
+        """
+        if self._kdtree is None:
+            try:
+                self._kdtree = CellTree(self.polygons)
+            except ImportError as err:
+                msg = "The kdtree engine requires scipy."
+                raise ImportError(msg) from err
+        return self._kdtree
+
+    def _strtree_locate(self, lon, lat):
+        points = shapely.points(lon, lat)
+        # Same as a "contains" predicate, but counting the cell boundary.
+        found, cells = self.tree.query(points, predicate="covered_by")
+        index = np.full(points.size, -1, dtype=np.intp)
+        order = np.lexsort((cells, found))
+        found, first = np.unique(found[order], return_index=True)
+        index[found] = self.polygons.index[cells[order][first]]
+        return index
+
+    @property
+    def cell_mask(self):
+        """Return the boolean mask of the valid cells.
+
+        The mask has the shape of the cell grid, `(M - 1, N - 1)` for
+        structured grids and `(nfaces,)` for UGRID, and the polygons follow
+        the order of `np.nonzero(grid.cell_mask)`.
+
+        """
+        return self.polygons.cell_mask
+
     def __str__(self):
         """Return str."""
         return str(self.mesh)
@@ -81,9 +635,55 @@ class GridGeo:
     def outline(self):
         """Return grid outline."""
         if self._outline is None:
-            self._outline = unary_union(self.geometry)
+            self._outline = self.compute_outline()
+            if self._cache is not None:
+                self._cache.store_outline(self.cache_key, self._outline)
         return self._outline
 
+    def compute_outline(self, engine="auto", workers=None):
+        """Return the grid outline.
+
+        engine: "boundary" polygonizes the boundary edges of the valid cells,
+                from the cell mask for structured grids and from the edges
+                used by a single face for UGRID, "union" merges all the cells
+                with a unary union, "parallel" merges spatial tiles of cells
+                in a pool of `workers` threads, and "auto" uses "boundary" and
+                falls back to "union" if it fails
+
+        """
+        engines = ["auto", "boundary", "union", "parallel"]
+        if engine not in engines:
+            msg = f"Expected one of {engines}, got {engine}."
+            raise ValueError(msg)
+
+        if engine == "parallel":
+            return parallel_union(self.polygons, workers=workers)
+
+        if engine != "union":
+            try:
+                outline = polygonize_boundary(self._boundary_segments())
+            except shapely.errors.GEOSException:
+                if engine == "boundary":
+                    raise
+            else:
+                if engine == "boundary" or not outline.is_empty:
+                    return outline
+        return union_outline(self.polygons)
+
+    def _boundary_segments(self):
+        if self.mesh == "ugrid":
+            node_x, node_y, faces = self._mesh_arrays()
+            if self._topology is None:
+                # Reuse the edge topology cached on the mesh.
+                edges = self.variable.ugrid().boundary_edges(
+                    self.polygons.mask,
+                )
+            else:
+                edges = boundary_edges(faces[self.polygons.mask])
+            node_x, node_y = np.asarray(node_x), np.asarray(node_y)
+            return np.stack([node_x[edges], node_y[edges]], axis=2)
+        return structured_boundary(self.polygons)
+
     @property
     def __geo_interface__(self):
         """Return __geo_interface__."""
@@ -91,72 +691,140 @@ class GridGeo:
             self._geo_interface = self.geometry.__geo_interface__
         return self._geo_interface
 
-    def to_geojson(self, **kw):
+    def _style(self, kw):
+        """Pop the simplestyle-spec properties from `kw`."""
+        return {
+            "title": kw.pop("title", self.mesh),
+            "description": kw.pop("description", ""),
+            "marker-size": kw.pop("marker-size", "medium"),
+            "marker-symbol": kw.pop("marker-symbol", ""),
+            "marker-color": kw.pop("marker-color", "7e7e7e"),
+            "stroke": kw.pop("stroke", "555555"),
+            "stroke-opacity": kw.pop("stroke-opacity", 1),
+            "stroke-width": kw.pop("stroke-width", 2),
+            "fill": kw.pop("fill", "555555"),
+            "fill-opacity": kw.pop("fill-opacity", 0.6),
+        }
+
+    def to_geojson(self, *, per_cell=False, **kw):
         """Return a GeoJSON representation of an grid object.
 
         The `kw` are based on the simplestyle-spec:
         https://github.com/mapbox/simplestyle-spec/tree/master/1.1.0
 
+        With `per_cell=True` return a FeatureCollection with a Polygon
+        Feature per cell and its grid indices, (j, i) or face, as properties.
+
         """
-        title = kw.pop("title", self.mesh)
-        description = kw.pop("description", "")
-        marker_size = kw.pop("marker-size", "medium")
-        marker_symbol = kw.pop("marker-symbol", "")
-        marker_color = kw.pop("marker-color", "7e7e7e")
-        stroke = kw.pop("stroke", "555555")
-        stroke_opacity = kw.pop("stroke-opacity", 1)
-        stroke_width = kw.pop("stroke-width", 2)
-        fill = kw.pop("fill", "555555")
-        fill_opacity = kw.pop("fill-opacity", 0.6)
+        properties = self._style(kw)
         float_precision = kw.pop("float_precision", 6)
-        geometry = copy(self.geometry.__geo_interface__)
-        geometry["coordinates"] = set_precision(
-            geometry["coordinates"],
-            float_precision,
-        )
+        if per_cell:
+            features = iter_features(
+                self.polygons,
+                float_precision=float_precision,
+            )
+            return {
+                "type": "FeatureCollection",
+                "properties": properties,
+                "features": list(chain.from_iterable(features)),
+            }
+
+        # Round the coordinate arrays in bulk and only build the nested
+        # lists at the end.
+        rings = iter_rings(self.polygons, float_precision=float_precision)
+        geometry = {
+            "type": "MultiPolygon",
+            "coordinates": [[ring] for batch in rings for ring in batch],
+        }
 
         return {
             "type": "Feature",
-            "properties": {
-                "title": title,
-                "description": description,
-                "marker-size": marker_size,
-                "marker-symbol": marker_symbol,
-                "marker-color": marker_color,
-                "stroke": stroke,
-                "stroke-opacity": stroke_opacity,
-                "stroke-width": stroke_width,
-                "fill": fill,
-                "fill-opacity": fill_opacity,
-            },
+            "properties": properties,
             "geometry": geometry,
         }
 
-    def save(self, filename, fmt=None, **kw):
-        """Save to file."""
+    def to_arrow(self, columns=None, encoding="WKB"):
+        """Return a pyarrow.Table with a row per valid cell.
+
+        The table has the cell grid indices, (j, i) or face, the optional
+        `columns`, and a GeoParquet `geometry` column encoded as "WKB" or as
+        the native GeoArrow "polygon". The `columns` are a mapping of names
+        to arrays with the shape of the cell grid, `grid_shape` or the
+        `cell_mask.shape` of a `bbox` window, or with a value per cell,
+        e.g.: `{"temp": grid.variable[1:, 1:]}`.
+
+        """
+        columns = _window_columns(columns, self.window, self.grid_shape)
+        return to_arrow(self.polygons, columns=columns, encoding=encoding)
+
+    def save(self, filename, fmt=None, *, per_cell=False, **kw):
+        """Save to file.
+
+        The formats are GeoJSON (geojson), ESRI Shapefile (shp),
+        GeoPackage (gpkg), and GeoParquet (parquet). With `per_cell=True`
+        each cell is saved as a separate feature/record with its grid
+        indices, (j, i) or face. GeoParquet is always saved per cell and
+        takes the `columns` and `encoding` of `to_arrow`.
+
+        In the out-of-core mode, see `block_rows`, the GeoJSON, GeoParquet,
+        and per-cell outputs are streamed block by block and the `columns`
+        must have the shape of the cell grid, not a value per cell.
+
+        """
         filename = Path(filename)
-        formats = ["shp", "geojson"]
+        drivers = {"shp": "ESRI Shapefile", "gpkg": "GPKG"}
+        formats = ["geojson", "parquet", *drivers]
         extension = filename.suffix
 
         if not fmt:
             fmt = extension.lstrip(".")
 
         if fmt not in formats:
-            msg = f"Expected shp or geojson, got {fmt}."
+            msg = f"Expected one of {formats}, got {fmt}."
             raise ValueError(msg)
 
         if extension.lstrip(".") != fmt:
             filename = f"{filename}.{fmt}"
 
         if fmt == "geojson":
-            import json  # noqa: PLC0415
-
-            geojson = self.to_geojson(**kw)
-            kw = {"sort_keys": True, "indent": 4, "separators": (",", ": ")}
+            properties = self._style(kw)
+            float_precision = kw.pop("float_precision", 6)
             with Path.open(filename, "w") as f:
-                json.dump(geojson, f, **kw)
+                write_geojson(
+                    f,
+                    self._blocks(),
+                    properties,
+                    float_precision,
+                    per_cell=per_cell,
+                )
+
+        if fmt == "parquet":
+            columns = kw.pop("columns", None)
+            encoding = kw.pop("encoding", "WKB")
+            blocks = self._blocks()
+            if isinstance(blocks, PolygonArray):
+                table = self.to_arrow(columns=columns, encoding=encoding)
+            else:
+                columns = _window_columns(
+                    columns,
+                    self.window,
+                    self.grid_shape,
+                )
+                table = (
+                    to_arrow(
+                        block,
+                        columns=_block_columns(columns, block),
+                        encoding=encoding,
+                        bbox=False,
+                    )
+                    for block in blocks
+                )
+            write_parquet(filename, table)
+
+        if fmt in drivers and per_cell:
+            write_records(filename, self._blocks(), drivers[fmt])
 
-        if fmt == "shp":
+        elif fmt in drivers:
             import fiona  # noqa: PLC0415
 
             name = kw.pop("name", self.mesh)
@@ -166,7 +834,7 @@ class GridGeo:
                 "properties": {"name": f"str:{len(name)}"},
             }
 
-            with fiona.open(filename, "w", "ESRI Shapefile", schema) as f:
+            with fiona.open(filename, "w", drivers[fmt], schema) as f:
                 f.write(
                     {
                         "geometry": self.__geo_interface__,
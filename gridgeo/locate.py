@@ -0,0 +1,209 @@
+"""Array-based point-in-cell locators that do not build shapely polygons."""
+
+import numpy as np
+
+_BATCH_SIZE = 100_000
+# The neighbors first queried per KD-tree, and the relative padding of the
+# cell radii.
+_NEIGHBORS = 8
+_RTOL = 1e-9
+
+
+def _axis_index(axis, values):
+    """Return the cell index of `values` along a monotonic 1D node `axis`,
+    -1 outside of it.
+
+    """
+    ncells = axis.size - 1
+    descending = axis[0] > axis[-1]
+    if descending:
+        # Search the reversed axis from the right, so the values on a shared
+        # node still go to the lowest cell index once flipped back.
+        index = np.searchsorted(axis[::-1], values, side="right") - 1
+        index = ncells - 1 - np.clip(index, 0, ncells - 1)
+        axis = axis[::-1]
+    else:
+        index = np.searchsorted(axis, values, side="left") - 1
+        index = np.clip(index, 0, ncells - 1)
+    outside = ~((values >= axis[0]) & (values <= axis[-1]))
+    index[outside] = -1
+    return index
+
+
+def searchsorted_locate(x, y, cell_mask, lon, lat):
+    """Return the flat cell index of each `(lon, lat)` point in a rectilinear
+    grid with the 1D node axes `x` and `y`, -1 outside the valid cells.
+
+    """
+    i = _axis_index(np.asarray(x), np.asarray(lon))
+    j = _axis_index(np.asarray(y), np.asarray(lat))
+    inside = (i >= 0) & (j >= 0)
+    flat = np.ravel_multi_index(
+        (np.where(inside, j, 0), np.where(inside, i, 0)),
+        cell_mask.shape,
+    )
+    valid = inside & cell_mask.ravel()[flat]
+    return np.where(valid, flat, -1)
+
+
+def _in_cells(px, py, cells):
+    """Return the `(inside, on_edge)` boolean arrays for the points
+    `(px, py)`, with shape `(n,)`, and the `(n, k, nvertices, 2)` candidate
+    cells. `inside` includes the points on the cell boundary.
+
+    """
+    x0, y0 = cells[..., 0], cells[..., 1]
+    x1, y1 = np.roll(x0, -1, axis=-1), np.roll(y0, -1, axis=-1)
+    px, py = px[:, None, None], py[:, None, None]
+    cross = (x1 - x0) * (py - y0) - (y1 - y0) * (px - x0)
+    on_edge = (
+        (cross == 0)
+        & (np.minimum(x0, x1) <= px)
+        & (px <= np.maximum(x0, x1))
+        & (np.minimum(y0, y1) <= py)
+        & (py <= np.maximum(y0, y1))
+    ).any(axis=-1)
+    # Crossing number, horizontal edges never cross.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xcross = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+    crosses = ((y0 > py) != (y1 > py)) & (px < xcross)
+    return on_edge | (crosses.sum(axis=-1) % 2 == 1), on_edge
+
+
+class CellTree:
+    """KD-trees over the centers of the valid cells of a PolygonArray with
+    cells of the same number of vertices, see `kdtree_locate`.
+
+    A point in a cell is never farther from its center than the cell
+    radius, the largest center to vertex distance. The cells are grouped by
+    radius, within a factor `ratio`, with a tree each, so the search around
+    a point is bounded by the size of the cells near it and not by the
+    largest cell of the grid.
+
+    """
+
+    def __init__(self, polygons, ratio=2):
+        """Return the CellTree of `polygons` (PolygonArray)."""
+        from scipy.spatial import cKDTree  # noqa: PLC0415
+
+        self.cells = polygons.cells()
+        self.index = polygons.index
+        self.centers = polygons.centers()
+        offsets = self.cells - self.centers[:, None, :]
+        radii = np.sqrt((offsets**2).sum(axis=-1).max(axis=-1, initial=0))
+        # Padded, so the vertices are not lost to rounding.
+        self.radii = radii * (1 + _RTOL)
+        self.tree = cKDTree(self.centers)
+        self.classes = []
+        positive = self.radii[self.radii > 0]
+        if positive.size:
+            smallest = positive.min()
+            size = np.maximum(self.radii, smallest) / smallest
+            level = np.floor(np.log(size) / np.log(ratio)).astype(int)
+            for value in np.unique(level):
+                members = np.flatnonzero(level == value)
+                tree = cKDTree(self.centers[members])
+                self.classes.append((tree, members, self.radii[members].max()))
+
+    def __len__(self):
+        """Return the number of cells."""
+        return len(self.index)
+
+    @property
+    def nbytes(self):
+        """Return the bytes used by the cells, centers, and tree arrays."""
+        trees = [self.tree] + [tree for tree, _, _ in self.classes]
+        arrays = [self.cells, self.index, self.centers, self.radii]
+        arrays.extend(members for _, members, _ in self.classes)
+        for tree in trees:
+            arrays.extend([tree.data, tree.indices])
+        return sum(array.nbytes for array in arrays)
+
+    def _neighbors(self, tree, points, radius):
+        """Return the `(owner, candidates)` pairs of point and tree entry
+        within `radius` of each other.
+
+        """
+        k = min(_NEIGHBORS, tree.n)
+        _, candidates = tree.query(points, k=k, distance_upper_bound=radius)
+        candidates = candidates.reshape(points.shape[0], k)
+        found = candidates < tree.n
+        # The full rows may have more neighbors.
+        full = np.flatnonzero(found[:, -1])
+        found[full] = False
+        owner, column = np.nonzero(found)
+        candidates = candidates[owner, column]
+        if full.size:
+            more = tree.query_ball_point(points[full], r=radius)
+            counts = np.array([len(item) for item in more], dtype=np.intp)
+            owner = np.concatenate([owner, np.repeat(full, counts)])
+            candidates = np.concatenate(
+                [candidates, np.concatenate(more).astype(np.intp)],
+            )
+        return owner, candidates
+
+    def search(self, points):
+        """Return the lowest cell index of the cells containing each point,
+        -1 outside all of them, checking every cell with the point within
+        its radius.
+
+        """
+        nowhere = np.iinfo(np.intp).max
+        lowest = np.full(points.shape[0], nowhere, dtype=np.intp)
+        for tree, members, radius in self.classes:
+            owner, candidates = self._neighbors(tree, points, radius)
+            cells = members[candidates]
+            offsets = points[owner] - self.centers[cells]
+            near = np.hypot(offsets[:, 0], offsets[:, 1]) <= self.radii[cells]
+            owner, cells = owner[near], cells[near]
+            inside, _ = _in_cells(
+                points[owner, 0],
+                points[owner, 1],
+                self.cells[cells][:, None],
+            )
+            inside = inside[:, 0]
+            np.minimum.at(lowest, owner[inside], self.index[cells[inside]])
+        return np.where(lowest == nowhere, -1, lowest)
+
+    def locate(self, points):
+        """Return the lowest cell index of the cells containing each point,
+        -1 outside all of them.
+
+        Most points are strictly inside the cell with the nearest center,
+        the others, on a shared edge or in another cell, are searched with
+        `search`, and the ones farther than the largest radius from all the
+        centers are discarded early.
+
+        """
+        found = np.full(points.shape[0], -1, dtype=np.intp)
+        if not len(self):
+            return found
+        distance, nearest = self.tree.query(
+            points,
+            distance_upper_bound=self.radii.max(),
+        )
+        near = np.flatnonzero(np.isfinite(distance))
+        cells = self.cells[nearest[near]][:, None]
+        inside, on_edge = _in_cells(points[near, 0], points[near, 1], cells)
+        inside, on_edge = inside[:, 0], on_edge[:, 0]
+        found[near[inside]] = self.index[nearest[near[inside]]]
+        pending = near[~inside | on_edge]
+        if pending.size:
+            found[pending] = self.search(points[pending])
+        return found
+
+
+def kdtree_locate(tree, lon, lat):
+    """Return the flat cell index of each `(lon, lat)` point, -1 outside the
+    valid cells, using the KD-trees over the cell centers of `tree`
+    (CellTree).
+
+    """
+    lon, lat = np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)
+    index = np.full(lon.shape, -1, dtype=np.intp)
+    valid = np.flatnonzero(np.isfinite(lon) & np.isfinite(lat))
+    for start in range(0, valid.size, _BATCH_SIZE):
+        batch = valid[start : start + _BATCH_SIZE]
+        points = np.column_stack([lon[batch], lat[batch]])
+        index[batch] = tree.locate(points)
+    return index
@@ -0,0 +1,99 @@
+"""Grid outline from the cell topology."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import shapely
+
+from gridgeo.ugrid import boundary_connectivity, edge_connectivity
+
+
+def boundary_edges(faces):
+    """Return the `(nedges, 2)` node indices of the edges used by exactly one
+    face in the `(nfaces, nvertices)` face-node connectivity array, padded
+    with `-1` at the end of the rows of mixed meshes.
+
+    """
+    return boundary_connectivity(*edge_connectivity(faces))
+
+
+def structured_boundary(polygons):
+    """Return the `(nsegments, 2, 2)` boundary segments of the valid cells of
+    a structured grid PolygonArray.
+
+    A cell edge is on the boundary when the neighbor cell across it is
+    invalid or outside the grid.
+
+    """
+    nrows, ncols = polygons.shape
+    cells = polygons.coords.reshape(nrows, ncols, 4, -1)
+    padded = np.zeros((nrows + 2, ncols + 2), dtype=bool)
+    padded[1:-1, 1:-1] = valid = polygons.cell_mask
+    # The cell vertices are (j, i), (j, i+1), (j+1, i+1), and (j+1, i).
+    sides = (
+        (valid & ~padded[:-2, 1:-1], [0, 1]),
+        (valid & ~padded[1:-1, 2:], [1, 2]),
+        (valid & ~padded[2:, 1:-1], [2, 3]),
+        (valid & ~padded[1:-1, :-2], [3, 0]),
+    )
+    return np.concatenate([cells[side][:, nodes] for side, nodes in sides])
+
+
+def polygonize_boundary(segments):
+    """Return the area enclosed by the `(nsegments, 2, 2)` boundary segments.
+
+    The segments are polygonized and the resulting regions are kept when
+    their nesting depth is odd, i.e.: inside the grid and not in a hole.
+
+    """
+    lines = shapely.linestrings(segments)
+    regions = shapely.get_parts(shapely.polygonize(lines))
+    shells = shapely.polygons(shapely.get_exterior_ring(regions))
+    points = shapely.point_on_surface(regions)
+    inside, _ = shapely.STRtree(shells).query(points, predicate="within")
+    depth = np.bincount(inside, minlength=regions.size)
+    return shapely.union_all(regions[depth % 2 == 1])
+
+
+def union_outline(polygons):
+    """Return the union of all the cells in a PolygonArray."""
+    return shapely.union_all(polygons.to_shapely())
+
+
+def _tiles(centers, ntiles):
+    """Split the cells into about `ntiles` spatially compact tiles: columns
+    sorted by x that are split into rows sorted by y.
+
+    """
+    nsplits = int(np.ceil(np.sqrt(ntiles)))
+    tiles = []
+    for column in np.array_split(np.argsort(centers[:, 0]), nsplits):
+        rows = column[np.argsort(centers[column, 1])]
+        tiles.extend(np.array_split(rows, nsplits))
+    return [tile for tile in tiles if tile.size]
+
+
+def parallel_union(polygons, workers=None):
+    """Return the union of all the cells in a PolygonArray using a pool of
+    `workers` threads (default: the number of CPUs).
+
+    The cells are split in spatial tiles that are merged in parallel and the
+    tile results are merged pairwise, in a tree, until one is left. Shapely
+    releases the GIL so the threads run concurrently.
+
+    """
+    workers = workers or os.cpu_count() or 1
+    geometries = polygons.to_shapely()
+    tiles = _tiles(polygons.centers(), ntiles=4 * workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parts = list(
+            pool.map(lambda t: shapely.union_all(geometries[t]), tiles),
+        )
+        while len(parts) > 1:
+            # Neighbor tiles are merged first.
+            pairs = [parts[k : k + 2] for k in range(0, len(parts), 2)]
+            parts = list(pool.map(shapely.union_all, pairs))
+    if not parts:
+        return shapely.union_all(geometries)
+    return parts[0]
@@ -0,0 +1,234 @@
+"""Array-backed storage for the grid cell polygons."""
+
+from collections.abc import Sequence
+
+import numpy as np
+import shapely
+
+
+class PolygonArray(Sequence):
+    """Grid cell polygons stored in a single coordinate array.
+
+    coords: `(ncoords, 2)` array with the vertices of every cell
+    offsets: `(ncells + 1,)` array, cell `k` is
+             `coords[offsets[k]:offsets[k + 1]]`
+    mask: `(ncells,)` boolean array, `False` for invalid cells
+    shape: shape of the cell grid, `(M - 1, N - 1)` for structured grids
+           and `(nfaces,)` for UGRID
+    start: flat index of the first cell in the full cell grid, for blocks
+           of cell rows, see `CFVariable.iter_polygons`
+    offset: `(row, column)` of the cell grid in the full dataset grid, for
+            the `bbox` windows of structured grids, see `GridGeo.window`
+
+    Iterating and indexing only visit the valid cells, so this behaves like
+    the list of `(nvertices, 2)` arrays returned by earlier versions.
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        coords,
+        offsets,
+        mask=None,
+        shape=None,
+        start=0,
+        *,
+        offset=(0, 0),
+    ):
+        """Return a PolygonArray."""
+        self.coords = np.asarray(coords)
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        ncells = self.offsets.size - 1
+        if mask is None:
+            mask = np.ones(ncells, dtype=bool)
+        self.mask = np.asarray(mask, dtype=bool)
+        if self.mask.shape != (ncells,):
+            msg = f"Expected a mask with {ncells} cells, got {self.mask.size}."
+            raise ValueError(msg)
+        self.shape = (ncells,) if shape is None else tuple(shape)
+        if np.prod(self.shape) != ncells:
+            msg = f"Cannot reshape {ncells} cells into {self.shape}."
+            raise ValueError(msg)
+        self.start = int(start)
+        self.offset = tuple(int(v) for v in offset)
+        self._index = None
+
+    @classmethod
+    def from_cells(
+        cls,
+        cells,
+        mask=None,
+        shape=None,
+        start=0,
+        *,
+        offset=(0, 0),
+    ):
+        """Return a PolygonArray from a `(ncells, nvertices, 2)` array."""
+        ncells, nvertices, ndim = cells.shape
+        offsets = np.arange(ncells + 1) * nvertices
+        coords = cells.reshape(ncells * nvertices, ndim)
+        return cls(coords, offsets, mask, shape, start, offset=offset)
+
+    @classmethod
+    def from_ragged(  # noqa: PLR0913
+        cls,
+        coords,
+        ring_sizes,
+        mask=None,
+        shape=None,
+        start=0,
+        *,
+        offset=(0, 0),
+    ):
+        """Return a PolygonArray from the concatenated cell vertices and the
+        number of vertices of each cell.
+
+        """
+        offsets = np.zeros(len(ring_sizes) + 1, dtype=np.intp)
+        np.cumsum(ring_sizes, out=offsets[1:])
+        return cls(coords, offsets, mask, shape, start, offset=offset)
+
+    @classmethod
+    def concatenate(cls, arrays):
+        """Return a PolygonArray joining consecutive blocks of cell rows."""
+        arrays = list(arrays)
+        sizes = [array.offsets[-1] for array in arrays]
+        shifts = np.cumsum([0, *sizes[:-1]])
+        offsets = np.concatenate(
+            [[0]]
+            + [
+                array.offsets[1:] + shift
+                for array, shift in zip(arrays, shifts, strict=True)
+            ],
+        )
+        nrows = sum(array.shape[0] for array in arrays)
+        return cls(
+            np.concatenate([array.coords for array in arrays]),
+            offsets,
+            np.concatenate([array.mask for array in arrays]),
+            shape=(nrows, *arrays[0].shape[1:]),
+            start=arrays[0].start,
+            offset=arrays[0].offset,
+        )
+
+    @property
+    def ring_sizes(self):
+        """Return the number of vertices of each cell."""
+        return np.diff(self.offsets)
+
+    @property
+    def nvertices(self):
+        """Return the number of vertices per cell when all the cells have
+        the same number of vertices, `None` otherwise.
+
+        """
+        sizes = self.ring_sizes
+        if sizes.size and (sizes == sizes[0]).all():
+            return int(sizes[0])
+        return None
+
+    @property
+    def cell_mask(self):
+        """Return the validity mask with the shape of the cell grid."""
+        return self.mask.reshape(self.shape)
+
+    @property
+    def index(self):
+        """Return the position of each valid cell in the full cell array."""
+        if self._index is None:
+            self._index = np.flatnonzero(self.mask)
+        return self._index
+
+    def cell_indices(self):
+        """Return the grid indices of the valid cells, in the full dataset
+        grid.
+
+        A `{"j": ..., "i": ...}` mapping for structured grids and a
+        `{"face": ...}` mapping for UGRID.
+
+        """
+        index = self.index + self.start
+        ndim = 2
+        if len(self.shape) == ndim:
+            j, i = np.divmod(index, self.shape[1])
+            return {"j": j + self.offset[0], "i": i + self.offset[1]}
+        return {"face": index}
+
+    def valid_coords(self):
+        """Return the concatenated vertices of the valid cells."""
+        if self.mask.all():
+            return self.coords
+        return self.coords[np.repeat(self.mask, self.ring_sizes)]
+
+    def closed_rings(self):
+        """Return the vertices of the valid cells, with the first vertex
+        repeated at the end of each ring, and their `(n + 1,)` offsets.
+
+        """
+        sizes = self.ring_sizes[self.mask]
+        coords = self.valid_coords()
+        offsets = np.zeros(sizes.size + 1, dtype=np.intp)
+        np.cumsum(sizes + 1, out=offsets[1:])
+        closed = np.empty((offsets[-1], coords.shape[-1]), dtype=coords.dtype)
+        # Shift every vertex by the number of closing vertices before it.
+        shift = np.repeat(np.arange(sizes.size), sizes)
+        closed[np.arange(coords.shape[0]) + shift] = coords
+        closed[offsets[1:] - 1] = coords[offsets[:-1] - np.arange(sizes.size)]
+        return closed, offsets
+
+    def centers(self):
+        """Return the `(n, 2)` vertex average of each valid cell."""
+        sizes = self.ring_sizes[self.mask]
+        if not sizes.size:
+            return np.empty((0, self.coords.shape[-1]))
+        starts = np.zeros(sizes.size, dtype=np.intp)
+        np.cumsum(sizes[:-1], out=starts[1:])
+        sums = np.add.reduceat(self.valid_coords(), starts, axis=0)
+        return sums / sizes[:, None]
+
+    def cells(self):
+        """Return the valid cells as a `(n, nvertices, 2)` array.
+
+        Only available when all the cells have the same number of vertices.
+
+        """
+        nvertices = self.nvertices
+        if nvertices is None:
+            msg = "Cells have different number of vertices."
+            raise ValueError(msg)
+        cells = self.coords.reshape(-1, nvertices, self.coords.shape[-1])
+        if self.mask.all():
+            return cells
+        return cells[self.mask]
+
+    def to_shapely(self):
+        """Return an array with a shapely Polygon for each valid cell."""
+        if not self:
+            return np.empty(0, dtype=object)
+        if self.nvertices is not None:
+            return shapely.polygons(self.cells())
+        indices = np.repeat(np.arange(len(self)), self.ring_sizes[self.mask])
+        rings = shapely.linearrings(self.valid_coords(), indices=indices)
+        return shapely.polygons(rings)
+
+    def _cell(self, k):
+        return self.coords[self.offsets[k] : self.offsets[k + 1]]
+
+    def __len__(self):
+        """Return the number of valid cells."""
+        return self.index.size
+
+    def __getitem__(self, key):
+        """Return the vertices of the valid cell(s) at `key`."""
+        if isinstance(key, slice):
+            return [self._cell(k) for k in self.index[key]]
+        return self._cell(self.index[key])
+
+    def __iter__(self):
+        """Iterate over the vertices of the valid cells."""
+        for k in self.index:
+            yield self._cell(k)
+
+    def __repr__(self):
+        """Return repr."""
+        return f"<PolygonArray: {len(self)} cells>"
@@ -1,8 +1,13 @@
 """Lightweight UGRID-1.0 parser."""
 
+import functools
+from collections.abc import Mapping
+
 import netCDF4
 import numpy as np
 
+from gridgeo.attributes import attribute_index
+
 
 def _valid_x(var):
     names = ["longitude", "grid_longitude", "projection_x_coordinate"]
@@ -51,7 +56,9 @@ def _mandatory_attr(var, attribute):
 
 def get_mesh_var(nc):
     """Return the mesh_topology variable for `nc` (netCDF4.Dataset object)."""
-    mesh_var = nc.get_variables_by_attributes(cf_role="mesh_topology")
+    mesh_var = attribute_index(nc).get_variables_by_attributes(
+        cf_role="mesh_topology",
+    )
     if not mesh_var:
         msg = f"Could not find mesh_topology variable in the dataset {nc}"
         raise ValueError(msg)
@@ -72,33 +79,341 @@ def get_mesh_var(nc):
     return mesh_var
 
 
-def connectivity_array(connectivity, num_ind):
+def connectivity_array(connectivity, num_ind, dimension=None):
     """Return the connectivity array for its correspdonding `netCDF4.Variable`
     according to UGRID-1.0.
 
+    The array has one row per element, zero based indices, and `-1` for the
+    missing indices (`_FillValue`, `missing_value`, or `flag_values`) of
+    mixed meshes, e.g.: triangles padded to quads, moved to the end of each
+    row. The rows are the `dimension` of the connectivity variable when
+    given, e.g.: the mesh `face_dimension`.
+
     """
     array = connectivity[:]
+    missing = np.ma.getmaskarray(array)
+    array = np.ma.getdata(array)
     if not issubclass(array.dtype.type, np.integer):
         array = np.int_(array)
-    if array.shape[0] == num_ind:
-        array = array.T
+
+    flag_values = getattr(connectivity, "flag_values", None)
+    if flag_values is not None:
+        missing = missing | np.isin(array, np.atleast_1d(flag_values))
 
     start_index = int(getattr(connectivity, "start_index", 0))
-    if start_index >= 1:
-        array -= start_index
+    array = np.where(missing, -1, array - start_index)
 
-    # NB: This won't work for more than one flag value.
-    flag_values = getattr(connectivity, "flag_values", None)
-    if flag_values:
-        array[array == flag_values - start_index] = flag_values
+    if dimension in connectivity.dimensions:
+        if connectivity.dimensions[0] != dimension:
+            array = array.T
+    elif array.shape[0] == num_ind:
+        array = array.T
+
+    ndim = 2
+    if array.ndim == ndim and (array < 0).any():
+        # Keep the valid indices first, in order, and the padding last.
+        order = np.argsort(array < 0, axis=1, kind="stable")
+        array = np.take_along_axis(array, order, axis=1)
     return array
 
 
-def ugrid(nc):
+def triangulate(faces):
+    """Return the `(ntriangles, 3)` fan triangulation of the `faces`, padded
+    with `-1` as returned by `connectivity_array`, and the face index of
+    each triangle.
+
+    """
+    triangles, index = [], []
+    for k in range(1, faces.shape[1] - 1):
+        valid = np.flatnonzero(faces[:, k + 1] >= 0)
+        triangles.append(faces[valid][:, [0, k, k + 1]])
+        index.append(valid)
+    if not triangles:
+        return np.empty((0, 3), dtype=faces.dtype), np.empty(0, dtype=np.intp)
+    index = np.concatenate(index)
+    order = np.argsort(index, kind="stable")
+    return np.concatenate(triangles)[order], index[order]
+
+
+def face_cells(node_x, node_y, faces):
+    """Return the `(coords, ring_sizes)` of the `faces`, padded with `-1`,
+    for `PolygonArray.from_ragged`, built with fancy indexing.
+
+    """
+    valid = faces >= 0
+    nodes = faces[valid]
+    coords = np.column_stack(
+        [np.asarray(node_x)[nodes], np.asarray(node_y)[nodes]],
+    )
+    return coords, valid.sum(axis=1)
+
+
+def edge_connectivity(faces):
+    """Return the unique `(nedges, 2)` edge-node connectivity of the `faces`,
+    padded with `-1`, and the `(nfaces, nvertices)` face-edge connectivity,
+    edge `k` of a face goes from its node `k` to the next one.
+
+    The edges are sorted by node, with a lexsort of the face sides.
+
+    """
+    following = np.roll(faces, -1, axis=1)
+    # The last node of padded faces closes the ring with the first one.
+    following = np.where(following < 0, faces[:, :1], following)
+    valid = faces >= 0
+    sides = np.sort(np.stack([faces, following], axis=2)[valid], axis=1)
+    order = np.lexsort((sides[:, 1], sides[:, 0]))
+    sides = sides[order]
+    new = np.ones(sides.shape[0], dtype=bool)
+    new[1:] = (sides[1:] != sides[:-1]).any(axis=1)
+    edge = np.empty(sides.shape[0], dtype=np.intp)
+    edge[order] = np.cumsum(new) - 1
+    face_edges = np.full(faces.shape, -1, dtype=np.intp)
+    face_edges[valid] = edge
+    return sides[new], face_edges
+
+
+def face_face_connectivity(face_edges):
+    """Return the `(nfaces, nvertices)` face-face connectivity, the neighbor
+    across each edge of the `face_edges` (see `edge_connectivity`) or `-1`.
+
+    The neighbors are found by joining the face sides on their edge.
+
+    """
+    valid = face_edges >= 0
+    edge = face_edges[valid]
+    face = np.nonzero(valid)[0]
+    order = np.argsort(edge, kind="stable")
+    shared = np.flatnonzero(edge[order][1:] == edge[order][:-1])
+    first, second = order[shared], order[shared + 1]
+    neighbor = np.full(edge.size, -1, dtype=np.intp)
+    neighbor[first] = face[second]
+    neighbor[second] = face[first]
+    face_face = np.full(face_edges.shape, -1, dtype=np.intp)
+    face_face[valid] = neighbor
+    return face_face
+
+
+def boundary_connectivity(edges, face_edges):
+    """Return the `(nboundaries, 2)` edges, from `edge_connectivity`, that
+    are used by exactly one of the `face_edges`.
+
+    """
+    counts = np.bincount(face_edges[face_edges >= 0], minlength=len(edges))
+    return edges[counts == 1]
+
+
+def edge_index(edges, pairs):
+    """Return the row in the `(nedges, 2)` `edges` of each `(n, 2)` node
+    pair in `pairs`, in either node order, -1 when missing.
+
+    The pairs are joined on their sorted nodes with a searchsorted.
+
+    """
+    edges = np.sort(np.asarray(edges, dtype=np.int64), axis=1)
+    pairs = np.sort(np.asarray(pairs, dtype=np.int64), axis=1)
+    nnodes = max(edges.max(initial=-1), pairs.max(initial=-1)) + 1
+    keys = edges[:, 0] * nnodes + edges[:, 1]
+    wanted = pairs[:, 0] * nnodes + pairs[:, 1]
+    order = np.argsort(keys, kind="stable")
+    rows = np.full(wanted.shape, -1, dtype=np.intp)
+    if not keys.size:
+        return rows
+    position = np.minimum(np.searchsorted(keys[order], wanted), keys.size - 1)
+    found = keys[order][position] == wanted
+    rows[found] = order[position[found]]
+    return rows
+
+
+class UGridMesh(Mapping):
+    """A parsed UGRID mesh.
+
+    A read-only mapping, like the dictionary returned by earlier versions,
+    with the `nodes`, `faces`, `edges`, and `boundaries` entries, the other
+    `*_coordinates` and `*_connectivity` entries found in the mesh variable,
+    and shortcuts for the most used arrays.
+
+    The entries are read from the dataset on first access, use `load()` to
+    read all of them, e.g.: before closing the dataset.
+
+    The `edges`, `face_face_connectivity`, `boundaries`, and
+    `face_edge_connectivity` entries missing from the dataset are derived
+    from the face-node connectivity, see `edge_connectivity`.
+
+    """
+
+    def __init__(
+        self,
+        name,
+        entries,
+        face_nodes=None,
+        edge_nodes=None,
+        derived=(),
+    ):
+        """Return a UGridMesh for the mesh variable `name`, `entries` maps
+        the entry names to their values or to callables that read them.
+
+        face_nodes: the face-node connectivity, or the callable that reads
+                    it, used to derive the `derived` entries
+        edge_nodes: the edge-node connectivity of the dataset, or the
+                    callable that reads it, indexed by the derived
+                    `face_edge_connectivity`
+
+        """
+        self.name = name
+        self._entries = dict(entries)
+        self._loaded = {}
+        self._face_nodes = face_nodes
+        self._edge_nodes = edge_nodes
+        self._topology = None
+        for key in derived:
+            self._entries[key] = functools.partial(self._derive, key)
+
+    def _read(self, key, value):
+        """Return the `key` entry, or `value` when it was not selected."""
+        if key in self._entries:
+            return self[key]
+        return value() if callable(value) else value
+
+    def _derive(self, key):
+        if self._topology is None:
+            faces = self._read("faces", self._face_nodes)
+            self._topology = edge_connectivity(faces)
+        edges, face_edges = self._topology
+        if key == "edges":
+            return edges
+        if key == "face_edge_connectivity":
+            if self._edge_nodes is None:
+                return face_edges
+            # Index the edges of the dataset, in their own order.
+            rows = edge_index(self._read("edges", self._edge_nodes), edges)
+            return np.where(face_edges >= 0, rows[face_edges], -1)
+        # The neighbors and boundaries do not depend on the edge order.
+        if key == "face_face_connectivity":
+            return face_face_connectivity(face_edges)
+        return boundary_connectivity(edges, face_edges)
+
+    def __getitem__(self, key):
+        """Return the `key` entry, read it if needed."""
+        if key not in self._loaded:
+            value = self._entries[key]
+            self._loaded[key] = value() if callable(value) else value
+        return self._loaded[key]
+
+    def __iter__(self):
+        """Iterate over the entry names."""
+        return iter(self._entries)
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def __repr__(self):
+        """Return repr."""
+        return f"<UGridMesh: {self.name} ({', '.join(self)})>"
+
+    @property
+    def loaded(self):
+        """Return the names of the entries already read."""
+        return list(self._loaded)
+
+    def load(self):
+        """Read all the entries and return the mesh."""
+        for key in self:
+            self[key]
+        return self
+
+    @property
+    def node_x(self):
+        """Return the node x coordinates."""
+        return self["nodes"]["x"]
+
+    @property
+    def node_y(self):
+        """Return the node y coordinates."""
+        return self["nodes"]["y"]
+
+    @property
+    def faces(self):
+        """Return the face-node connectivity, see `connectivity_array`."""
+        return self["faces"]
+
+    def boundary_edges(self, mask=None):
+        """Return the `(nedges, 2)` node indices of the edges used by exactly
+        one of the faces selected by the boolean `mask`, default all.
+
+        The edge topology is derived once and reused for every `mask`.
+
+        """
+        if mask is None:
+            return self._derive("boundaries")
+        self._derive("edges")
+        edges, face_edges = self._topology
+        return boundary_connectivity(edges, face_edges[mask])
+
+
+_COORDINATES = (
+    "node_coordinates",
+    "face_coordinates",
+    "edge_coordinates",
+    "boundary_coordinates",
+)
+
+_CONNECTIVITY = {
+    "face_node_connectivity": 3,
+    "face_face_connectivity": 3,
+    "boundary_node_connectivity": 2,
+    "edge_node_connectivity": 2,
+}
+
+# Derived from the face-node connectivity when missing.
+_DERIVED = (
+    "edges",
+    "face_edge_connectivity",
+    "face_face_connectivity",
+    "boundaries",
+)
+
+# Used for compatibility with pyugrid.
+_RENAME = {
+    "node_coordinates": "nodes",
+    "face_node_connectivity": "faces",
+    "boundary_node_connectivity": "boundaries",
+    "edge_node_connectivity": "edges",
+}
+
+
+def _coordinates_loader(nc, coord_names):
+    """Return a callable that reads the `{"x": x, "y": y}` coordinates."""
+    axes = {}
+    for name in coord_names:
+        if _valid_x(nc[name]):
+            axes["x"] = nc[name]
+        elif _valid_y(nc[name]):
+            axes["y"] = nc[name]
+        else:
+            msg = f"Could not recognize axis for {nc[name]}"
+            raise ValueError(msg)
+    return lambda: {axis: var[:] for axis, var in axes.items()}
+
+
+def _connectivity_loader(connectivity, num_ind, dimension):
+    """Return a callable that reads the connectivity array."""
+    return lambda: connectivity_array(connectivity, num_ind, dimension)
+
+
+def ugrid(nc, load=None):
     """Parse UGRID conventions.
 
     Take a netCDF4.Dataset object or a netCDF4 file/url string
-    and returns a dictionary with the grid nodes, edges, and connectivy matrix.
+    and returns a UGridMesh with the grid nodes, edges, and connectivy
+    matrix.
+
+    Only the mesh metadata is parsed here, the coordinates and connectivity
+    arrays are read on first access, so the dataset must stay open until
+    then, see `UGridMesh.load`.
+
+    load: the entry names to keep, e.g.: `("nodes", "faces")`,
+          default all of them, including the derived ones (see UGridMesh)
 
     """
     if isinstance(nc, netCDF4.Dataset):
@@ -107,44 +422,38 @@ def ugrid(nc):
         nc = netCDF4.Dataset(nc)
 
     mesh_var = get_mesh_var(nc)
-    valid_coords = (
-        "node_coordinates",
-        "face_coordinates",
-        "edge_coordinates",
-        "boundary_coordinates",
-    )
-    valid_connectivity = {
-        "face_node_connectivity": 3,
-        "face_face_connectivity": 3,
-        "boundary_node_connectivity": 2,
-        "edge_node_connectivity": 2,
-    }
-
-    # Used for compatibility with pyugrid.
-    rename = {
-        "node_coordinates": "nodes",
-        "face_node_connectivity": "faces",
-        "boundary_node_connectivity": "boundaries",
-        "edge_node_connectivity": "edges",
-    }
-
     grid = {}
-    for key in mesh_var.__dict__:
-        if key in valid_coords:
+    for key in mesh_var.ncattrs():
+        name = _RENAME.get(key, key)
+        if key in _COORDINATES:
             coord_names = mesh_var.getncattr(key).strip().split()
-            for name in coord_names:
-                if _valid_x(nc[name]):
-                    x = nc[name][:]
-                elif _valid_y(nc[name]):
-                    y = nc[name][:]
-                else:
-                    msg = f"Could not recognize axis for {nc[name]}"
-                    raise ValueError(msg)
-            grid.update({key: {"x": x, "y": y}})
-        if key in valid_connectivity:
+            grid[name] = _coordinates_loader(nc, coord_names)
+        if key in _CONNECTIVITY:
             connectivity = nc[mesh_var.getncattr(key).strip()]
-            num_ind = valid_connectivity[key]
-            array = connectivity_array(connectivity, num_ind)
-            grid.update({key: array})
+            num_ind = _CONNECTIVITY[key]
+            dimension = getattr(
+                mesh_var,
+                f"{key.split('_')[0]}_dimension",
+                None,
+            )
+            grid[name] = _connectivity_loader(connectivity, num_ind, dimension)
 
-    return {rename.get(k, k): v for k, v in grid.items()}
+    derived = []
+    if "faces" in grid:
+        derived = [key for key in _DERIVED if key not in grid]
+    entries = grid
+    if load is not None:
+        valid = [*grid, *derived]
+        unknown = set(load) - set(valid)
+        if unknown:
+            msg = f"Expected one of {valid}, got {sorted(unknown)}."
+            raise ValueError(msg)
+        entries = {key: value for key, value in grid.items() if key in load}
+        derived = [key for key in derived if key in load]
+    return UGridMesh(
+        mesh_var.name,
+        entries,
+        face_nodes=grid.get("faces"),
+        edge_nodes=grid.get("edges"),
+        derived=derived,
+    )
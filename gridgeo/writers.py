@@ -0,0 +1,299 @@
+"""Writers for the grid cell polygons."""
+
+import json
+from itertools import chain, count
+
+import numpy as np
+import shapely
+
+from gridgeo.polygons import PolygonArray
+
+_BATCH_SIZE = 10_000
+
+
+# Distance to a half, of the scaled values, checked with the builtin round.
+_TIE = 1e-6
+
+
+def _round(coords, precision):
+    """Return `coords` rounded like the builtin `round`, in bulk.
+
+    `np.round` scales the values by `10**precision` first, so the values
+    close to a half can round the other way, those are rounded again with
+    the exact builtin `round`.
+
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    if precision is None:
+        return coords
+    precision = int(precision)
+    rounded = np.round(coords, precision)
+    scaled = np.abs(coords * 10.0**precision)
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < _TIE)
+    if ties.size:
+        flat = rounded.reshape(-1)
+        values = coords.reshape(-1)[ties].tolist()
+        flat[ties] = [round(value, precision) for value in values]
+    return rounded
+
+
+def _blocks(polygons):
+    """Return `polygons` as an iterable of PolygonArray blocks."""
+    if isinstance(polygons, PolygonArray):
+        return [polygons]
+    return polygons
+
+
+def _block_rings(polygons, float_precision, batch_size):
+    index = polygons.index
+    for start in range(0, index.size, batch_size):
+        cells = index[start : start + batch_size]
+        if polygons.nvertices is not None:
+            nvertices = polygons.nvertices
+            rings = polygons.coords.reshape(-1, nvertices, 2)[cells]
+            rings = np.concatenate([rings, rings[:, :1]], axis=1)
+            yield _round(rings, float_precision).tolist()
+        else:
+            offsets = polygons.offsets
+            yield [
+                [*ring, ring[0]]
+                for ring in (
+                    _round(
+                        polygons.coords[offsets[k] : offsets[k + 1]],
+                        float_precision,
+                    ).tolist()
+                    for k in cells
+                )
+            ]
+
+
+def iter_rings(polygons, float_precision=6, batch_size=_BATCH_SIZE):
+    """Yield batches of closed rings, as nested lists, for the valid cells
+    in `polygons` (PolygonArray or an iterable of PolygonArray blocks). The
+    coordinates are rounded in bulk to `float_precision` decimals, use
+    `None` to keep the full precision.
+
+    """
+    for block in _blocks(polygons):
+        yield from _block_rings(block, float_precision, batch_size)
+
+
+def iter_features(polygons, float_precision=6, batch_size=_BATCH_SIZE):
+    """Yield batches of GeoJSON-like Polygon features, one per valid cell in
+    `polygons` (PolygonArray or an iterable of PolygonArray blocks), with the
+    cell grid indices as properties.
+
+    """
+    for block in _blocks(polygons):
+        columns = block.cell_indices()
+        batches = _block_rings(block, float_precision, batch_size)
+        for start, rings in zip(count(0, batch_size), batches, strict=False):
+            stop = start + len(rings)
+            values = zip(
+                *(column[start:stop].tolist() for column in columns.values()),
+                strict=True,
+            )
+            yield [
+                {
+                    "type": "Feature",
+                    "properties": dict(zip(columns, value, strict=True)),
+                    "geometry": {"type": "Polygon", "coordinates": [ring]},
+                }
+                for value, ring in zip(values, rings, strict=True)
+            ]
+
+
+def _write_batches(f, batches):
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        if not first:
+            f.write(", ")
+        # Strip the enclosing brackets to join the batches.
+        f.write(json.dumps(batch, sort_keys=True)[1:-1])
+        first = False
+
+
+def write_geojson(
+    f,
+    polygons,
+    properties,
+    float_precision=6,
+    *,
+    per_cell=False,
+):
+    """Write `polygons` (PolygonArray or an iterable of PolygonArray blocks)
+    as GeoJSON to the open text file `f`.
+
+    By default the grid is written as a single Feature with a MultiPolygon
+    geometry. With `per_cell=True` it is written as a FeatureCollection with
+    a Polygon Feature per cell, see `iter_features`, and `properties` are
+    stored as a foreign member of the collection.
+
+    The coordinates are written polygon by polygon, in batches, without
+    building the whole GeoJSON object in memory.
+
+    """
+    if per_cell:
+        f.write('{"features": [')
+        _write_batches(f, iter_features(polygons, float_precision))
+        f.write('], "properties": ')
+        f.write(json.dumps(properties, sort_keys=True))
+        f.write(', "type": "FeatureCollection"}')
+        return
+
+    f.write('{"geometry": {"coordinates": [')
+    _write_batches(
+        f,
+        (
+            [[ring] for ring in rings]
+            for rings in iter_rings(polygons, float_precision)
+        ),
+    )
+    f.write('], "type": "MultiPolygon"}, "properties": ')
+    f.write(json.dumps(properties, sort_keys=True))
+    f.write(', "type": "Feature"}')
+
+
+def write_records(filename, polygons, driver, float_precision=None):
+    """Write `polygons` (PolygonArray or an iterable of PolygonArray blocks)
+    with fiona, using `driver`, as one Polygon record per cell with the cell
+    grid indices as properties.
+
+    The records are written in batches with `writerecords`.
+
+    """
+    import fiona  # noqa: PLC0415
+
+    # The schema comes from the first block, the blocks can be a generator.
+    blocks = iter(_blocks(polygons))
+    first = next(blocks, None)
+    names = [] if first is None else first.cell_indices()
+    schema = {"geometry": "Polygon", "properties": dict.fromkeys(names, "int")}
+    with fiona.open(filename, "w", driver, schema) as f:
+        if first is None:
+            return
+        for features in iter_features(chain([first], blocks), float_precision):
+            f.writerecords(features)
+
+
+def _cell_column(values, polygons):
+    values = np.asarray(values)
+    if values.shape == polygons.shape:
+        values = values.reshape(-1)[polygons.index]
+    if values.shape != (len(polygons),):
+        msg = (
+            f"Expected a column with shape {polygons.shape} or "
+            f"({len(polygons)},), got {values.shape}."
+        )
+        raise ValueError(msg)
+    return values
+
+
+def _geoarrow_polygons(polygons):
+    import pyarrow as pa  # noqa: PLC0415
+
+    coords, ring_offsets = polygons.closed_rings()
+    vertices = pa.StructArray.from_arrays(
+        [
+            pa.array(np.ascontiguousarray(coords[:, 0], dtype=np.float64)),
+            pa.array(np.ascontiguousarray(coords[:, 1], dtype=np.float64)),
+        ],
+        names=["x", "y"],
+    )
+    rings = pa.ListArray.from_arrays(
+        pa.array(ring_offsets.astype(np.int32)),
+        vertices,
+    )
+    # One ring (the exterior) per polygon.
+    polygon_offsets = np.arange(len(polygons) + 1, dtype=np.int32)
+    return pa.ListArray.from_arrays(pa.array(polygon_offsets), rings)
+
+
+def to_arrow(polygons, columns=None, encoding="WKB", *, bbox=True):
+    """Return a pyarrow.Table with a row per valid cell in `polygons`
+    (PolygonArray): the cell grid indices, the optional `columns`, and the
+    GeoParquet `geometry` column.
+
+    columns: mapping of column names to arrays with the shape of the cell
+             grid, masked with the valid cells, or with a value per valid cell
+    encoding: "WKB" or the native GeoArrow "polygon" encoding, built straight
+              from the coordinate array
+    bbox: store the optional GeoParquet column bbox, tables for blocks of a
+          larger grid should not set it
+
+    """
+    import pyarrow as pa  # noqa: PLC0415
+
+    encodings = ["WKB", "polygon"]
+    if encoding not in encodings:
+        msg = f"Expected one of {encodings}, got {encoding}."
+        raise ValueError(msg)
+
+    data = {
+        name: pa.array(values.astype(np.int64))
+        for name, values in polygons.cell_indices().items()
+    }
+    for name, values in (columns or {}).items():
+        data[name] = pa.array(_cell_column(values, polygons))
+
+    if encoding == "WKB":
+        geometry = pa.array(shapely.to_wkb(polygons.to_shapely()), pa.binary())
+        extension = "geoarrow.wkb"
+    else:
+        geometry = _geoarrow_polygons(polygons)
+        extension = "geoarrow.polygon"
+
+    column = {"encoding": encoding, "geometry_types": ["Polygon"]}
+    if bbox:
+        coords = polygons.valid_coords()
+        column["bbox"] = (
+            [
+                *np.nanmin(coords, axis=0).tolist(),
+                *np.nanmax(coords, axis=0).tolist(),
+            ]
+            if len(polygons)
+            else []
+        )
+    geo = {
+        "version": "1.1.0",
+        "primary_column": "geometry",
+        "columns": {"geometry": column},
+    }
+    fields = [pa.field(name, array.type) for name, array in data.items()]
+    fields.append(
+        pa.field(
+            "geometry",
+            geometry.type,
+            metadata={
+                "ARROW:extension:name": extension,
+                "ARROW:extension:metadata": "{}",
+            },
+        ),
+    )
+    schema = pa.schema(fields, metadata={"geo": json.dumps(geo)})
+    return pa.Table.from_arrays([*data.values(), geometry], schema=schema)
+
+
+def write_parquet(filename, table):
+    """Write a `to_arrow` table, or an iterable of tables with the same
+    schema, to a GeoParquet file. The tables are written one at a time.
+
+    """
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    if isinstance(table, pa.Table):
+        pq.write_table(table, filename)
+        return
+
+    writer = None
+    try:
+        for block in table:
+            if writer is None:
+                writer = pq.ParquetWriter(filename, block.schema)
+            writer.write_table(block)
+    finally:
+        if writer is not None:
+            writer.close()
@@ -0,0 +1,134 @@
+"""Datasets, writers and fixtures shared by the tests."""
+
+from pathlib import Path
+
+import netCDF4
+import numpy as np
+import pytest
+
+import gridgeo
+
+data = Path(__file__).parent.absolute().joinpath("data")
+
+# The structured grid datasets and the standard_name of their variable.
+datasets = {
+    "sgrid.nc": "sea_water_potential_temperature",
+    "unknown_1d.nc": "sea_water_potential_temperature",
+    "unknown_2d.nc": "sea_water_temperature",
+}
+
+
+@pytest.fixture(scope="module", params=datasets)
+def dataset(request):
+    """Return the file name of each of the structured grid datasets."""
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def selector(dataset):
+    """Return the variable selector of `dataset`."""
+    return {"standard_name": datasets[dataset]}
+
+
+@pytest.fixture(scope="module")
+def grid(dataset, selector):
+    """Return the GridGeo of `dataset`."""
+    return gridgeo.GridGeo(data.joinpath(dataset), **selector)
+
+
+def write_grid(fname, lon, lat):
+    """Write a `temp` variable on the `lon` and `lat` nodes, 1D axes for an
+    unknown_1d grid and 2D ones for an unknown_2d grid.
+
+    """
+    lon, lat = np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)
+    with netCDF4.Dataset(fname, "w") as nc:
+        if lon.ndim == 1:
+            nc.createDimension("lat", lat.size)
+            nc.createDimension("lon", lon.size)
+            dims = {"lon": ("lon",), "lat": ("lat",), "temp": ("lat", "lon")}
+        else:
+            nc.createDimension("y", lon.shape[0])
+            nc.createDimension("x", lon.shape[1])
+            dims = dict.fromkeys(["lon", "lat", "temp"], ("y", "x"))
+        for name, units, values in (
+            ("lon", "degrees_east", lon),
+            ("lat", "degrees_north", lat),
+        ):
+            var = nc.createVariable(name, "f8", dims[name])
+            var.units = units
+            var[:] = values
+        temp = nc.createVariable("temp", "f4", dims["temp"])
+        temp.standard_name = "sea_water_temperature"
+        temp.coordinates = "lon lat"
+        temp[:] = 0
+
+
+# A 2 x 2 square mesh with 3 quads and 2 triangles padded to quads.
+node_x = np.array([0, 1, 2, 0, 1, 2, 0, 1, 2], dtype=float)
+node_y = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2], dtype=float)
+faces = np.array(
+    [
+        [0, 1, 4, 3],
+        [1, 2, 5, -1],
+        [1, 5, 4, -1],
+        [3, 4, 7, 6],
+        [4, 5, 8, 7],
+    ],
+)
+
+
+def write_ugrid(fname, variant):
+    """Write the mixed mesh as a UGRID file, with the padding of the faces
+    encoded as a `_FillValue`, `flag_values`, or as a one based and
+    transposed connectivity array.
+
+    """
+    fill = -999
+    with netCDF4.Dataset(fname, "w") as nc:
+        nc.createDimension("node", node_x.size)
+        nc.createDimension("face", faces.shape[0])
+        nc.createDimension("max_face_nodes", faces.shape[1])
+        mesh = nc.createVariable("mesh", "i4")
+        mesh.cf_role = "mesh_topology"
+        mesh.topology_dimension = 2
+        mesh.node_coordinates = "lon lat"
+        mesh.face_node_connectivity = "face_nodes"
+        mesh.face_dimension = "face"
+        for name, units, values in (
+            ("lon", "degrees_east", node_x),
+            ("lat", "degrees_north", node_y),
+        ):
+            var = nc.createVariable(name, "f8", ("node",))
+            var.units = units
+            var[:] = values
+
+        connectivity = np.where(faces < 0, fill, faces)
+        dims = ("face", "max_face_nodes")
+        if variant == "fill":
+            var = nc.createVariable("face_nodes", "i4", dims, fill_value=fill)
+        elif variant == "flag":
+            var = nc.createVariable("face_nodes", "i4", dims, fill_value=False)
+            var.flag_values = fill
+        else:
+            connectivity = np.where(faces < 0, fill, faces + 1).T
+            dims = dims[::-1]
+            var = nc.createVariable("face_nodes", "i4", dims, fill_value=fill)
+            var.start_index = 1
+        var.cf_role = "face_node_connectivity"
+        var[:] = connectivity
+
+        temp = nc.createVariable("temp", "f4", ("node",))
+        temp.standard_name = "sea_water_potential_temperature"
+        temp.mesh = "mesh"
+        temp.location = "node"
+        temp.coordinates = "lon lat"
+        temp[:] = node_x + node_y
+
+
+@pytest.fixture(params=["fill", "flag", "transposed"])
+def ugrid_file(request, tmp_path):
+    """Return the mixed mesh written with each of the padding variants."""
+    fname = tmp_path.joinpath(f"ugrid_{request.param}.nc")
+    write_ugrid(fname, request.param)
+    return fname
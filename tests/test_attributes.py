@@ -0,0 +1,94 @@
+import gc
+import weakref
+from pathlib import Path
+
+import netCDF4
+import numpy as np
+import pytest
+
+from gridgeo.attributes import AttributeIndex, _indexes, attribute_index
+
+p = Path(__file__).parent.absolute()
+
+queries = [
+    {"standard_name": "latitude"},
+    {"standard_name": lambda x: x and str(x).lower() == "longitude"},
+    {"units": "degrees_north", "standard_name": "latitude"},
+    {"axis": lambda x: x and str(x).lower() == "x"},
+    {"cf_role": lambda v: v in ("grid_topology", "mesh_topology")},
+    {"cf_role": "grid_topology", "topology_dimension": 2},
+    {"long_name": lambda v: v is None},
+    {"name": "temp"},
+    {"standard_name": "not_in_the_dataset"},
+]
+
+
+@pytest.fixture(params=["sgrid.nc", "unknown_1d.nc", "unknown_2d.nc"])
+def nc(request):
+    return netCDF4.Dataset(p.joinpath("data", request.param))
+
+
+@pytest.mark.parametrize("kwargs", queries)
+def test_same_as_netcdf4(nc, kwargs):
+    index = AttributeIndex(nc)
+    expected = [var.name for var in nc.get_variables_by_attributes(**kwargs)]
+    found = [var.name for var in index.get_variables_by_attributes(**kwargs)]
+    assert found == expected
+
+
+def test_attribute_index_cache(nc):
+    index = attribute_index(nc)
+    assert attribute_index(nc) is index
+    assert attribute_index(nc, refresh=True) is not index
+
+
+def test_array_attribute():
+    nc = netCDF4.Dataset(p.joinpath("data", "unknown_2d.nc"))
+    index = AttributeIndex(nc)
+    kwargs = {"valid_range": np.array([-361.0, 361.0])}
+    found = [var.name for var in index.get_variables_by_attributes(**kwargs)]
+    assert found == ["lat", "lon"]
+
+
+def test_callable_calls():
+    nc = netCDF4.Dataset("callables.nc", "w", diskless=True)
+    nc.createDimension("x", 1)
+    names = ["name_0", "name_1", "name_2"]
+    for k in range(100):
+        var = nc.createVariable(f"v{k}", "f4", ("x",))
+        if k < len(names):
+            var.standard_name = names[k]
+        if k < 2:  # noqa: PLR2004
+            var.units = "m"
+    index = AttributeIndex(nc)
+    calls = []
+
+    def selector(value):
+        calls.append(value)
+        return value == "name_1"
+
+    # Only called for the variables with the attribute, and once with None.
+    found = index.get_variables_by_attributes(standard_name=selector)
+    assert [var.name for var in found] == ["v1"]
+    assert sorted(calls, key=str) == [None, *names]
+    calls.clear()
+    found = index.get_variables_by_attributes(
+        standard_name=selector,
+        units="m",
+    )
+    assert [var.name for var in found] == ["v1"]
+    assert sorted(calls, key=str) == [None, *names[:2]]
+
+
+def test_index_does_not_keep_the_dataset():
+    nc = netCDF4.Dataset(p.joinpath("data", "sgrid.nc"))
+    ref = weakref.ref(nc)
+    gc.collect()
+    before = len(_indexes)
+    attribute_index(nc).get_variables_by_attributes(standard_name="latitude")
+    assert len(_indexes) == before + 1
+    nc.close()
+    del nc
+    gc.collect()
+    assert ref() is None
+    assert len(_indexes) == before
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import gridgeo
+
+p = Path(__file__).parent.absolute()
+
+# The bbox of each dataset and the number of cells in it.
+bboxes = {
+    "sgrid.nc": ((-73.5, 40.2, -72.8, 40.8), 7061),
+    "unknown_1d.nc": ((235, 35, 237.3, 36.1), 2964),
+    "unknown_2d.nc": ((-73.8, 39.0, -72.7, 40.2), 563),
+}
+
+
+@pytest.fixture(scope="module")
+def grids(dataset, selector, grid):
+    fname = p.joinpath("data", dataset)
+    bbox, _ = bboxes[dataset]
+    subset = gridgeo.GridGeo(fname, bbox=bbox, **selector)
+    return grid, subset
+
+
+def test_bbox(dataset, grids):
+    grid, subset = grids
+    rows, columns = subset.window
+    assert subset.x.shape[-1] == columns.stop - columns.start
+    assert subset.cell_mask.shape == (
+        rows.stop - rows.start - 1,
+        columns.stop - columns.start - 1,
+    )
+    window = (
+        slice(rows.start, rows.stop - 1),
+        slice(columns.start, columns.stop - 1),
+    )
+    cells = grid.polygons.coords.reshape(*grid.cell_mask.shape, 4, 2)
+    expected = cells[window][subset.cell_mask]
+    _, ncells = bboxes[dataset]
+    assert expected.shape[0] == ncells
+    np.testing.assert_array_equal(subset.polygons.cells(), expected)
+
+
+def test_full_grid_indices(grids):
+    grid, subset = grids
+    rows, columns = subset.window
+    assert rows.start > 0 or columns.start > 0
+    assert subset.grid_shape == grid.cell_mask.shape
+    j, i = np.nonzero(subset.cell_mask)
+    j, i = j + rows.start, i + columns.start
+    indices = subset.polygons.cell_indices()
+    np.testing.assert_array_equal(indices["j"], j)
+    np.testing.assert_array_equal(indices["i"], i)
+
+    centers = subset.polygons.centers()
+    expected = grid.locate(centers[:, 0], centers[:, 1], engine="strtree")
+    np.testing.assert_array_equal(
+        expected,
+        np.ravel_multi_index((j, i), grid.cell_mask.shape),
+    )
+    for engine in ("auto", "strtree"):
+        index = subset.locate(centers[:, 0], centers[:, 1], engine=engine)
+        np.testing.assert_array_equal(index, expected)
+    assert subset.locate(1e6, 1e6) == -1
+
+
+def test_to_arrow_indices(grids):
+    pytest.importorskip("pyarrow")
+    _, subset = grids
+    table = subset.to_arrow()
+    indices = subset.polygons.cell_indices()
+    assert table["j"].to_pylist() == indices["j"].tolist()
+    assert table["i"].to_pylist() == indices["i"].tolist()
+
+
+def test_to_arrow_columns(grids):
+    pytest.importorskip("pyarrow")
+    grid, subset = grids
+    index = np.arange(np.prod(grid.grid_shape)).reshape(grid.grid_shape)
+    table = subset.to_arrow(columns={"index": index})
+    expected = np.ravel_multi_index(
+        tuple(subset.polygons.cell_indices().values()),
+        grid.grid_shape,
+    )
+    assert table["index"].to_pylist() == expected.tolist()
+    # The columns of the window itself are kept as they are.
+    rows, columns = subset.window
+    cells = index[rows.start : rows.stop - 1, columns.start : columns.stop - 1]
+    assert subset.to_arrow(columns={"index": cells}).equals(table)
+
+
+def test_block_indices(dataset, selector, grids):
+    pytest.importorskip("dask")
+    _, subset = grids
+    bbox, _ = bboxes[dataset]
+    fname = p.joinpath("data", dataset)
+    blocked = gridgeo.GridGeo(fname, bbox=bbox, block_rows=20, **selector)
+    blocks = [block.cell_indices() for block in blocked._blocks()]  # noqa: SLF001
+    for name, expected in subset.polygons.cell_indices().items():
+        indices = np.concatenate([block[name] for block in blocks])
+        np.testing.assert_array_equal(indices, expected)
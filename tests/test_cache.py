@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+
+import netCDF4
+import numpy as np
+import pytest
+
+import gridgeo
+from gridgeo.cache import DiskCache, cache_key, grid_digest
+from gridgeo.cfvariable import CFVariable
+
+p = Path(__file__).parent.absolute()
+
+fname = p.joinpath("data", "unknown_1d.nc")
+selector = {"standard_name": "sea_water_potential_temperature"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path.joinpath("cache"))
+
+
+def test_miss_and_hit(cache):
+    grid = gridgeo.GridGeo(fname, cache=cache, **selector)
+    assert grid.cache_key in cache
+    outline = grid.outline
+
+    cached = gridgeo.GridGeo(fname, lazy=True, cache=cache, **selector)
+    assert cached.cache_key == grid.cache_key
+    # Restored from the cache without reading the dataset.
+    assert cached._polygons is not None  # noqa: SLF001
+    assert cached._outline is not None  # noqa: SLF001
+    assert cached.mesh == grid.mesh
+    np.testing.assert_array_equal(cached.x, grid.x)
+    np.testing.assert_array_equal(cached.polygons.coords, grid.polygons.coords)
+    np.testing.assert_array_equal(cached.cell_mask, grid.cell_mask)
+    assert cached.outline.equals(outline)
+
+
+def test_store_reads_axes_once(cache, monkeypatch):
+    calls = []
+    read_axis = CFVariable.read_axis
+
+    def counted(self, name, window=None):
+        calls.append(name)
+        return read_axis(self, name, window)
+
+    monkeypatch.setattr(CFVariable, "read_axis", counted)
+    grid = gridgeo.GridGeo(fname, lazy=True, cache=cache, **selector)
+    _ = grid.polygons
+    assert grid.cache_key in cache
+    assert sorted(calls) == ["x", "y"]
+
+
+def test_bbox_window(cache):
+    bbox = (235, 35, 237.3, 36.1)
+    grid = gridgeo.GridGeo(fname, bbox=bbox, cache=cache, **selector)
+    cached = gridgeo.GridGeo(fname, bbox=bbox, cache=cache, **selector)
+    assert cached.window == grid.window
+    assert cached.grid_shape == grid.grid_shape != cached.cell_mask.shape
+    assert cached.polygons.offset == grid.polygons.offset != (0, 0)
+    other = gridgeo.GridGeo(fname, lazy=True, cache=cache, **selector)
+    assert other.cache_key != grid.cache_key
+
+
+def test_cache_key(tmp_path):
+    grid = gridgeo.GridGeo(fname, lazy=True, **selector)
+    key = cache_key(fname, selector, grid.variable)
+    assert key == cache_key(str(fname), selector, grid.variable)
+    assert key != cache_key("https://example.com", selector, grid.variable)
+    assert key != cache_key(fname, selector, grid.variable, bbox=(0, 0, 1, 1))
+    copy = tmp_path.joinpath("copy.nc")
+    copy.write_bytes(fname.read_bytes())
+    assert key != cache_key(copy, selector, grid.variable)
+
+
+def test_grid_digest(tmp_path):
+    grid = gridgeo.GridGeo(fname, lazy=True, **selector)
+    digest = grid_digest(grid.variable)
+    copy = tmp_path.joinpath("copy.nc")
+    copy.write_bytes(fname.read_bytes())
+    with netCDF4.Dataset(copy, "a") as nc:
+        other = gridgeo.GridGeo(nc, lazy=True, **selector)
+        # Same grid in another file.
+        assert grid_digest(other.variable) == digest
+        assert grid_digest(grid.variable, bbox=(0, 0, 1, 1)) != digest
+        x = other.variable.x_axis()
+        x[:1] = x[:1] + 1
+        assert grid_digest(other.variable) != digest
+
+
+def test_invalidate(cache):
+    grid = gridgeo.GridGeo(fname, cache=cache, **selector)
+    _ = grid.outline
+    cache.invalidate(grid.cache_key)
+    assert grid.cache_key not in cache
+    assert cache.load(grid.cache_key) is None
+    assert cache.nbytes == 0
+
+    gridgeo.GridGeo(fname, cache=cache, **selector)
+    cache.clear()
+    assert not list(cache.directory.iterdir())
+
+
+def test_lru_eviction(cache):
+    bboxes = [(235, 35, 236, 36), (235, 35, 237, 37), (235, 35, 238, 38)]
+    keys = []
+    for bbox in bboxes:
+        grid = gridgeo.GridGeo(fname, bbox=bbox, cache=cache, **selector)
+        keys.append(grid.cache_key)
+    paths = [cache._path(key, ".npz") for key in keys]  # noqa: SLF001
+    for age, path in enumerate(paths):
+        os.utime(path, (age, age))
+    # Use the first one, so the second is the least recently used.
+    assert cache.load(keys[0]) is not None
+    sizes = [path.stat().st_size for path in paths]
+    cache.max_bytes = sizes[0] + sizes[2]
+    cache._evict()  # noqa: SLF001
+    assert [key in cache for key in keys] == [True, False, True]
@@ -1,12 +1,23 @@
 from itertools import zip_longest
+from pathlib import Path
 
+import netCDF4
 import numpy as np
 import pytest
 from hypothesis import given
 from hypothesis.extra.numpy import array_shapes
 from shapely.geometry import MultiPolygon
 
-from gridgeo.cfvariable import _filled_masked, _make_grid
+from gridgeo.cfvariable import (
+    CFVariable,
+    _axis_window,
+    _bbox_cells,
+    _filled_masked,
+    _make_grid,
+)
+from gridgeo.gridgeo import _cell_geometries
+
+p = Path(__file__).parent.absolute()
 
 
 @pytest.fixture
@@ -50,6 +61,20 @@ def test__valid_geometry(coords):
     assert geometry.bounds == (1, 1, 4, 4)
 
 
+def test__cell_geometries(coords):
+    polygons = _make_grid(coords)
+    expected = MultiPolygon(list(zip_longest(polygons, [])))
+    geometry = MultiPolygon(list(_cell_geometries(polygons)))
+    assert geometry.equals_exact(expected, 0)
+
+
+def test__cell_geometries_ragged():
+    polygons = [[(0, 0), (1, 0), (1, 1)], [(0, 0), (1, 1), (0, 1), (-1, 1)]]
+    geometries = _cell_geometries(polygons)
+    n_vertices = [4, 5]
+    assert [len(g.exterior.coords) for g in geometries] == n_vertices
+
+
 def test__filled_masked():
     marr = np.ma.MaskedArray(
         data=[1, 2, 3, 4],
@@ -59,3 +84,98 @@ def test__filled_masked():
     )
     arr = _filled_masked(marr)
     assert np.isnan(arr[2])
+
+
+def test__make_grid_mask(coords):
+    coords = coords.astype(float)
+    coords[0, 0] = np.nan
+    polygons = _make_grid(coords)
+    n_polygons = 8
+    assert len(polygons) == n_polygons
+    assert polygons.cell_mask.shape == (3, 3)
+    assert not polygons.cell_mask[0, 0]
+    assert polygons.cell_mask.sum() == n_polygons
+    assert (polygons[0] == coords[[0, 0, 1, 1], [1, 2, 2, 1]]).all()
+
+
+def test_cached_topology():
+    nc = netCDF4.Dataset(p.joinpath("data", "sgrid.nc"))
+    var = CFVariable(nc, standard_name="sea_water_potential_temperature")
+    assert var.topology() == "sgrid"
+    assert var.x_axis().name == "lon_rho"
+    assert {"topology", "x_axis"} <= set(var._cache)  # noqa: SLF001
+    var.invalidate()
+    assert not var._cache  # noqa: SLF001
+    assert var.topology() == "sgrid"
+
+
+def test__axis_window():
+    axis = np.arange(10.0)
+    assert _axis_window(axis, 2.5, 4.5) == slice(2, 6)
+    assert _axis_window(axis[::-1], 2.5, 4.5) == slice(4, 8)
+    # A point inside a single cell.
+    assert _axis_window(axis, 2.5, 2.5) == slice(2, 4)
+    assert _axis_window(axis, 20, 30) == slice(0, 0)
+
+
+def test__bbox_cells(coords):
+    cells = _make_grid(coords).cells()
+    inside = _bbox_cells(cells, (1.5, 1.5, 2.5, 1.5))
+    assert inside.tolist() == [True, True, False] + [False] * 6
+
+
+def test_window_raises():
+    nc = netCDF4.Dataset(p.joinpath("data", "sgrid.nc"))
+    var = CFVariable(nc, standard_name="sea_water_potential_temperature")
+    with pytest.raises(ValueError, match="No grid cells intersect"):
+        var.window((0, 0, 1, 1))
+    with pytest.raises(ValueError, match="Expected"):
+        var.window((1, 1, 0, 0))
+
+
+@pytest.fixture
+def chunked(tmp_path):
+    fname = tmp_path.joinpath("chunked.nc")
+    lon, lat = np.meshgrid(np.linspace(0, 10, 30), np.linspace(0, 5, 50))
+    lon += lat / 10
+    with netCDF4.Dataset(fname, "w") as nc:
+        nc.createDimension("y", 50)
+        nc.createDimension("x", 30)
+        chunks = {"zlib": True, "chunksizes": (7, 30)}
+        for name, units, values in (
+            ("lon", "degrees_east", lon),
+            ("lat", "degrees_north", lat),
+        ):
+            var = nc.createVariable(name, "f8", ("y", "x"), **chunks)
+            var.units = units
+            var[:] = values
+        temp = nc.createVariable("temp", "f4", ("y", "x"), **chunks)
+        temp.standard_name = "sea_water_temperature"
+        temp.coordinates = "lon lat"
+        temp[:] = lon + lat
+    with netCDF4.Dataset(fname) as nc:
+        yield CFVariable(nc, standard_name="sea_water_temperature")
+
+
+def test_iter_chunks(chunked):
+    rows = [block for block, _ in chunked.iter_chunks(block_rows=10)]
+    assert [(r.start, r.stop) for r in rows[:2]] == [(0, 7), (7, 14)]
+    assert rows[-1].stop == chunked.shape[0]
+    rows = [block for block, _ in chunked.iter_chunks(15, rows=slice(3, 40))]
+    assert [(r.start, r.stop) for r in rows] == [(3, 14), (14, 28), (28, 40)]
+    blocks = [block for _, block in chunked.iter_chunks(columns=slice(2, 5))]
+    np.testing.assert_array_equal(np.concatenate(blocks), chunked[:, 2:5])
+
+
+def test_chunked_reads(chunked):
+    window = (slice(4, 33), slice(3, 20))
+    lon = chunked.x_axis()[:]
+    np.testing.assert_array_equal(chunked.read_axis("x", window), lon[window])
+    bbox = (2, 1, 4, 2)
+    assert chunked.window(bbox, block_size=1) == chunked.window(bbox)
+    expected = chunked.polygons()
+    pytest.importorskip("dask")
+    polygons = chunked.polygons(block_rows=8)
+    np.testing.assert_array_equal(polygons.coords, expected.coords)
+    blocks = list(chunked.iter_polygons(block_rows=8))
+    assert [block.shape[0] for block in blocks] == [7] * 7
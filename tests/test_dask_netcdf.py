@@ -0,0 +1,139 @@
+from pathlib import Path
+
+import netCDF4
+import numpy as np
+import pytest
+
+dask = pytest.importorskip("dask")
+
+import gridgeo  # noqa: E402
+from gridgeo.dask_netcdf import (  # noqa: E402
+    DaskNetCDF,
+    NetCDFSource,
+    compute_blocks,
+    native_chunks,
+)
+
+p = Path(__file__).parent.absolute()
+
+
+@pytest.fixture(scope="module")
+def nc():
+    with netCDF4.Dataset(p.joinpath("data", "sgrid.nc")) as nc:
+        yield nc
+
+
+@pytest.fixture(scope="module")
+def lon(nc):
+    return DaskNetCDF(NetCDFSource.from_variable(nc["lon_rho"]))
+
+
+def test_lazy_getitem(nc, lon):
+    block = lon[2:5, ::2]
+    assert isinstance(block, DaskNetCDF)
+    assert block.shape == (3, 173)
+    np.testing.assert_array_equal(block.compute(), nc["lon_rho"][2:5, ::2])
+
+
+def test_ufuncs(nc, lon):
+    expected = np.deg2rad(nc["lon_rho"][:]) + 1
+    result = np.deg2rad(lon) + 1
+    assert isinstance(result, DaskNetCDF)
+    np.testing.assert_allclose(np.asarray(result), expected)
+
+
+def test_array_function(nc, lon):
+    result = np.concatenate([lon, lon[:1]])
+    assert isinstance(result, DaskNetCDF)
+    assert result.shape == (129, 345)
+    west = -73
+    where = np.where(lon > west, lon, np.nan)
+    expected = np.where(nc["lon_rho"][:] > west, nc["lon_rho"][:], np.nan)
+    np.testing.assert_array_equal(np.asarray(where), expected)
+
+
+@pytest.mark.parametrize("reduction", ["min", "max", "mean", "sum"])
+@pytest.mark.parametrize("axis", [None, 0, 1])
+def test_reductions(nc, lon, reduction, axis):
+    expected = getattr(nc["lon_rho"][:], reduction)(axis=axis)
+    result = getattr(lon, reduction)(axis=axis)
+    assert isinstance(result, DaskNetCDF)
+    np.testing.assert_allclose(result.compute(), expected)
+
+
+def test_native_chunks(tmp_path):
+    fname = tmp_path.joinpath("chunked.nc")
+    with netCDF4.Dataset(fname, "w") as nc:
+        nc.createDimension("y", 100)
+        nc.createDimension("x", 60)
+        var = nc.createVariable("z", "f8", ("y", "x"), chunksizes=(10, 20))
+        var[:] = np.arange(6000).reshape(100, 60)
+    source = NetCDFSource(fname, "z")
+    chunks = native_chunks(source)
+    assert all(size % 10 == 0 for size in chunks[0][:-1])
+    assert all(size % 20 == 0 for size in chunks[1][:-1])
+    z = DaskNetCDF(source)
+    assert z.chunks == chunks
+    assert z.sum().compute() == np.arange(6000).sum()
+
+
+def test_native_chunks_contiguous(nc):
+    assert native_chunks(nc["lon_rho"]) == "auto"
+
+
+def test_compute_blocks():
+    tasks = [dask.delayed(pow)(k, 2) for k in range(5)]
+    assert list(compute_blocks(tasks, num_workers=2)) == [0, 1, 4, 9, 16]
+    with pytest.raises(ValueError, match="Expected one of"):
+        list(compute_blocks(tasks, scheduler="distributed"))
+
+
+@pytest.mark.parametrize("source", [False, True])
+def test_threaded_reads(nc, source):
+    var = nc["lon_rho"]
+    if source:
+        var = NetCDFSource.from_variable(var)
+    result = DaskNetCDF(var, chunks=(8, 16)).compute(
+        scheduler="threads",
+        num_workers=8,
+    )
+    np.testing.assert_array_equal(result, nc["lon_rho"][:])
+
+
+@pytest.mark.parametrize("dtype", ["f4", "i4"])
+def test_masked_array(tmp_path, dtype):
+    fname = tmp_path.joinpath("masked.nc")
+    with netCDF4.Dataset(fname, "w") as nc:
+        nc.createDimension("x", 4)
+        var = nc.createVariable("z", dtype, ("x",), fill_value=-999)
+        var[:] = np.ma.masked_equal([1, -999, 3, 4], -999)
+    z = DaskNetCDF(NetCDFSource(fname, "z"))
+    computed = z.compute()
+    assert computed.mask.tolist() == [False, True, False, False]
+    data = np.asarray(z)
+    assert not isinstance(data, np.ma.MaskedArray)
+    np.testing.assert_array_equal(data, [1, np.nan, 3, 4])
+    assert np.isnan(np.asarray(z[1:3]))[0]
+
+
+def test_from_variable_in_memory(nc):
+    memory = p.joinpath("data", "sgrid.nc").read_bytes()
+    with netCDF4.Dataset("in_memory.nc", memory=memory) as mem:
+        var = mem["lon_rho"]
+        assert NetCDFSource.from_variable(var) is var
+        lon = DaskNetCDF(NetCDFSource.from_variable(var))
+        np.testing.assert_array_equal(lon.compute(), nc["lon_rho"][:])
+        selector = {"standard_name": "sea_water_potential_temperature"}
+        blocked = gridgeo.GridGeo(mem, block_rows=50, **selector)
+        grid = gridgeo.GridGeo(mem, **selector)
+        with pytest.raises(ValueError, match="In-memory"):
+            _ = gridgeo.GridGeo(
+                mem,
+                block_rows=50,
+                scheduler="processes",
+                **selector,
+            ).polygons
+        np.testing.assert_array_equal(
+            blocked.polygons.coords,
+            grid.polygons.coords,
+        )
@@ -0,0 +1,276 @@
+import threading
+import time
+from pathlib import Path
+
+import netCDF4
+import numpy as np
+import pytest
+from conftest import datasets
+
+import gridgeo
+from gridgeo import factory
+from gridgeo.cfvariable import CFVariable
+from gridgeo.factory import GridCache
+
+p = Path(__file__).parent.absolute()
+
+fname = p.joinpath("data", "unknown_1d.nc")
+selector = {"standard_name": "sea_water_potential_temperature"}
+
+
+def test_hit_and_miss():
+    cache = GridCache()
+    grid = cache.get(fname, **selector)
+    assert isinstance(grid, gridgeo.GridGeo)
+    assert cache.get(str(fname), **selector) is grid
+    assert cache.get(fname, lazy=True, **selector) is not grid
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+    assert (
+        stats["nbytes"]
+        == grid.nbytes + cache.get(fname, lazy=True, **selector).nbytes
+    )
+
+
+def test_count_eviction():
+    cache = GridCache(max_entries=2)
+    bboxes = [(235, 35, 236, 36), (235, 35, 237, 37), (235, 35, 238, 38)]
+    grids = [cache.get(fname, bbox=bbox, **selector) for bbox in bboxes[:2]]
+    # The first one is now the most recently used.
+    assert cache.get(fname, bbox=bboxes[0], **selector) is grids[0]
+    cache.get(fname, bbox=bboxes[2], **selector)
+    assert cache.evictions == 1
+    assert cache.get(fname, bbox=bboxes[0], **selector) is grids[0]
+    assert cache.get(fname, bbox=bboxes[1], **selector) is not grids[1]
+
+
+def test_bytes_eviction():
+    cache = GridCache(max_bytes=1)
+    cache.get(fname, **selector)
+    # The newest grid is always kept.
+    assert len(cache) == 1
+    cache.get(fname, lazy=True, **selector)
+    assert len(cache) == 1
+    assert cache.evictions == 1
+
+
+def test_nbytes_derived():
+    grid = gridgeo.GridGeo(fname, **selector)
+    loaded = grid.nbytes
+    _ = grid.cells, grid.tree, grid.geometry, grid.outline
+    assert grid.nbytes > loaded + grid.polygons.coords.nbytes
+
+
+def test_bytes_eviction_on_hit():
+    cache = GridCache()
+    grids = [cache.get(fname, lazy=lazy, **selector) for lazy in (False, True)]
+    cache.max_bytes = cache.nbytes + 1
+    # Building the cells of the old grid pushes the cache over the limit.
+    _ = grids[0].cells
+    assert cache.get(fname, lazy=True, **selector) is grids[1]
+    assert len(cache) == 1
+    assert cache.evictions == 1
+
+
+def test_shared_build(monkeypatch):
+    builds = []
+
+    def slow_grid(nc, **kwargs):
+        builds.append(nc)
+        time.sleep(0.2)
+        return gridgeo.GridGeo(nc, **kwargs)
+
+    monkeypatch.setattr(factory, "GridGeo", slow_grid)
+    cache = GridCache()
+    results = []
+    nthreads = 4
+    barrier = threading.Barrier(nthreads)
+
+    def get():
+        barrier.wait()
+        results.append(cache.get(fname, **selector))
+
+    threads = [threading.Thread(target=get) for _ in range(nthreads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert all(grid is results[0] for grid in results)
+    assert cache.stats()["shared"] == nthreads - 1
+
+
+def test_failed_build():
+    cache = GridCache()
+    with pytest.raises(ValueError, match="Could not find any variables"):
+        cache.get(fname, standard_name="not_a_variable")
+    assert len(cache) == 0
+    assert not cache._building  # noqa: SLF001
+
+
+def test_get_grid():
+    gridgeo.grid_cache.clear()
+    grid = gridgeo.get_grid(fname, **selector)
+    assert gridgeo.get_grid(fname, **selector) is grid
+    assert gridgeo.grid_cache.hits == 1
+    gridgeo.grid_cache.clear()
+
+
+def test_from_files(tmp_path, monkeypatch):
+    paths = []
+    for k in range(3):
+        path = tmp_path.joinpath(f"run_{k}.nc")
+        path.write_bytes(fname.read_bytes())
+        paths.append(path)
+    # Shift the last grid.
+    with netCDF4.Dataset(paths[-1], "a") as nc:
+        x = gridgeo.GridGeo(nc, lazy=True, **selector).variable.x_axis()
+        nc[x.name][:] = nc[x.name][:] + 1
+
+    calls, reads = [], []
+    polygons, read_axis = CFVariable.polygons, CFVariable.read_axis
+
+    def counted(self, *args, **kwargs):
+        calls.append(self)
+        return polygons(self, *args, **kwargs)
+
+    def counted_read(self, *args, **kwargs):
+        reads.append(self)
+        return read_axis(self, *args, **kwargs)
+
+    monkeypatch.setattr(CFVariable, "polygons", counted)
+    monkeypatch.setattr(CFVariable, "read_axis", counted_read)
+    grids = gridgeo.GridGeo.from_files(paths, **selector)
+    assert len(grids) == len(paths)
+    # Built once for each of the 2 distinct grids.
+    ngrids = 2
+    assert len(calls) == ngrids
+    # The x and y axes are read once for each file.
+    assert len(reads) == 2 * len(paths)
+    # Only one dataset is open at a time.
+    assert not any(grid._nc.isopen() for grid in grids)  # noqa: SLF001
+    first, second, shifted = grids
+    assert second.polygons is first.polygons
+    assert second.outline is first.outline
+    assert second.variable is not first.variable
+    assert shifted.polygons is not first.polygons
+    assert not shifted.outline.equals(first.outline)
+    # The dataset is opened again for the data.
+    np.testing.assert_array_equal(second.variable[:], first.variable[:])
+    second.close()
+    with pytest.raises(TypeError, match="lazy"):
+        gridgeo.GridGeo.from_files(paths, lazy=True, **selector)
+
+
+class CountedReads:
+    """Count the reads of a netCDF variable."""
+
+    def __init__(self, var, reads):
+        """Wrap `var`, its reads are appended to `reads`."""
+        self._var = var
+        self._reads = reads
+
+    def __getattr__(self, name):
+        """Return the attributes of the variable."""
+        return getattr(self._var, name)
+
+    def __getitem__(self, key):
+        """Read the variable."""
+        self._reads.append(key)
+        return self._var[key]
+
+
+def _from_files_reads(monkeypatch, paths, **kwargs):
+    """Return the grids of `paths` and the number of coordinate reads."""
+    reads = []
+    with monkeypatch.context() as patch:
+        for name in ("x_axis", "y_axis"):
+            axis = getattr(CFVariable, name)
+            patch.setattr(
+                CFVariable,
+                name,
+                lambda self, axis=axis: CountedReads(axis(self), reads),
+            )
+        grids = gridgeo.GridGeo.from_files(paths, **kwargs)
+    return grids, len(reads)
+
+
+@pytest.mark.parametrize(
+    ("name", "bbox"),
+    [
+        ("unknown_1d.nc", (235, 35, 237, 37)),
+        ("unknown_2d.nc", (-73.8, 39.0, -72.7, 40.2)),
+    ],
+)
+def test_from_files_bbox(tmp_path, monkeypatch, name, bbox):
+    path = tmp_path.joinpath("run.nc")
+    path.write_bytes(p.joinpath("data", name).read_bytes())
+    selector = {"standard_name": datasets[name]}
+    (grid,), reads = _from_files_reads(
+        monkeypatch,
+        [path],
+        bbox=bbox,
+        **selector,
+    )
+    expected = gridgeo.GridGeo(p.joinpath("data", name), bbox=bbox, **selector)
+    np.testing.assert_array_equal(grid.x, expected.x)
+    np.testing.assert_array_equal(grid.y, expected.y)
+    assert grid.window == expected.window
+    assert grid.outline.equals(expected.outline)
+    # The window comes from the coordinates read for the digest.
+    _, full = _from_files_reads(monkeypatch, [path], **selector)
+    assert reads == full
+
+
+def test_from_files_closed(tmp_path):
+    name = "sgrid.nc"
+    paths = []
+    for k in range(2):
+        path = tmp_path.joinpath(f"run_{k}.nc")
+        path.write_bytes(p.joinpath("data", name).read_bytes())
+        paths.append(path)
+    selector = {"standard_name": datasets[name]}
+    bbox = (-73.5, 40.2, -72.8, 40.8)
+    grids = gridgeo.GridGeo.from_files(paths, bbox=bbox, **selector)
+    full = gridgeo.GridGeo(p.joinpath("data", name), lazy=True, **selector)
+    expected = full.locate(-73.2, 40.5)
+    assert expected >= 0
+    for grid in grids:
+        assert grid.locate(-73.2, 40.5) == expected
+        assert grid.grid_shape == full.cell_mask.shape
+        # The queries do not open the datasets again.
+        assert grid._var is None  # noqa: SLF001
+        assert not grid._nc.isopen()  # noqa: SLF001
+
+
+def test_close_twice(tmp_path):
+    path = tmp_path.joinpath("run.nc")
+    path.write_bytes(fname.read_bytes())
+    grids = gridgeo.GridGeo.from_files([path], **selector)
+    for grid in grids:
+        grid.close()
+        grid.close()
+    assert grids[0].outline.is_valid
+
+
+def test_close_in_memory():
+    nc = netCDF4.Dataset("in_memory.nc", memory=fname.read_bytes())
+    grid = gridgeo.GridGeo(nc, **selector)
+    grid.close()
+    # The loaded grid is kept.
+    assert grid.outline.is_valid
+    with pytest.raises(ValueError, match="in-memory dataset is closed"):
+        _ = grid.variable
+
+
+def test_in_memory_keys():
+    cache = GridCache()
+    grids = []
+    for name in ("unknown_1d.nc", "sgrid.nc"):
+        memory = p.joinpath("data", name).read_bytes()
+        nc = netCDF4.Dataset("in_memory.nc", memory=memory)
+        grids.append(cache.get(nc, **selector))
+        assert cache.get(nc, **selector) is grids[-1]
+    assert grids[0] is not grids[1]
+    assert grids[0].mesh == "unknown_1d"
+    assert grids[1].mesh == "sgrid"
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from conftest import write_grid
+
+import gridgeo
+from gridgeo.locate import _axis_index, _in_cells
+
+p = Path(__file__).parent.absolute()
+
+
+@pytest.fixture(scope="module")
+def points(grid):
+    rng = np.random.default_rng(42)
+    xmin, ymin, xmax, ymax = grid.geometry.bounds
+    lon = rng.uniform(xmin - 0.1, xmax + 0.1, 2000)
+    lat = rng.uniform(ymin - 0.1, ymax + 0.1, 2000)
+    return lon, lat
+
+
+def test_locate_engines(grid, points):
+    expected = grid.locate(*points, engine="strtree")
+    assert (expected >= 0).any()
+    assert (expected == -1).any()
+    if grid.mesh == "unknown_1d":
+        index = grid.locate(*points, engine="searchsorted")
+        assert (index == expected).all()
+    pytest.importorskip("scipy")
+    assert (grid.locate(*points, engine="kdtree") == expected).all()
+
+
+def test_locate_shape(grid, points):
+    lon, lat = points
+    index = grid.locate(lon.reshape(40, 50), lat.reshape(40, 50))
+    assert index.shape == (40, 50)
+
+
+def test_locate_auto(dataset, selector):
+    pytest.importorskip("scipy")
+    grid = gridgeo.GridGeo(p.joinpath("data", dataset), **selector)
+    lon, lat = grid.polygons.centers().T
+    index = grid.locate(lon, lat)
+    np.testing.assert_array_equal(index, np.flatnonzero(grid.cell_mask))
+    engine = "searchsorted" if grid.mesh == "unknown_1d" else "kdtree"
+    assert grid._locate_engine() == engine  # noqa: SLF001
+    # No shapely polygons are built.
+    assert grid._tree is None  # noqa: SLF001
+
+
+def test_locate_engine_name(grid):
+    with pytest.raises(ValueError, match="Expected one of"):
+        grid.locate(0, 0, engine="bisect")
+
+
+def test_axis_index():
+    axis = np.array([0, 1, 2, 3], dtype=float)
+    values = np.array([-1, 0, 0.5, 1, 2.5, 3, 4, np.nan])
+    expected = [-1, 0, 0, 0, 2, 2, -1, -1]
+    assert _axis_index(axis, values).tolist() == expected
+    # The values on a shared node go to the lowest cell index.
+    expected = [-1, 2, 2, 1, 0, 0, -1, -1]
+    assert _axis_index(axis[::-1], values).tolist() == expected
+
+
+def test_in_cells():
+    square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=float)
+    px = np.array([0.5, 1.0, 0.0, 1.5, 0.5])
+    py = np.array([0.5, 0.5, 0.0, 0.5, 1.5])
+    cells = np.broadcast_to(square, (5, 1, 4, 2))
+    inside, on_edge = _in_cells(px, py, cells)
+    assert inside[:, 0].tolist() == [True, True, True, False, False]
+    assert on_edge[:, 0].tolist() == [False, True, True, False, False]
+
+
+def test_locate_skewed(tmp_path):
+    pytest.importorskip("scipy")
+    fname = tmp_path.joinpath("skewed.nc")
+    # Skewed, high-aspect cells.
+    j, i = np.mgrid[:60, :80].astype(float)
+    write_grid(fname, i + 0.5 * j, 0.1 * j)
+    grid = gridgeo.GridGeo(fname, standard_name="sea_water_temperature")
+    assert grid.mesh == "unknown_2d"
+    rng = np.random.default_rng(0)
+    xmin, ymin, xmax, ymax = grid.geometry.bounds
+    lon = rng.uniform(xmin, xmax, 20000)
+    lat = rng.uniform(ymin, ymax, 20000)
+    expected = grid.locate(lon, lat, engine="strtree")
+    assert (expected >= 0).any()
+    assert (grid.locate(lon, lat, engine="kdtree") == expected).all()
+
+
+def test_locate_engine_support(grid):
+    if grid.mesh != "unknown_1d":
+        with pytest.raises(ValueError, match="searchsorted"):
+            grid.locate(0, 0, engine="searchsorted")
+
+
+def test_locate_descending_nodes(tmp_path):
+    fname = tmp_path.joinpath("descending.nc")
+    lon, lat = np.arange(5.0), np.arange(4.0)[::-1]
+    write_grid(fname, lon, lat)
+    grid = gridgeo.GridGeo(fname, standard_name="sea_water_temperature")
+    assert grid.mesh == "unknown_1d"
+    # Every node is on the edge of 1 to 4 cells.
+    x, y = np.meshgrid(lon, lat)
+    expected = grid.locate(x, y, engine="strtree")
+    assert expected[1, 0] == 0
+    assert (grid.locate(x, y, engine="searchsorted") == expected).all()
+    pytest.importorskip("scipy")
+    assert (grid.locate(x, y, engine="kdtree") == expected).all()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import shapely
+
+from gridgeo.cfvariable import _make_grid
+from gridgeo.outline import (
+    boundary_edges,
+    parallel_union,
+    polygonize_boundary,
+    structured_boundary,
+    union_outline,
+)
+from gridgeo.polygons import PolygonArray
+
+
+@pytest.fixture
+def coords():
+    x, y = np.meshgrid(np.arange(8, dtype=float), np.arange(6, dtype=float))
+    return np.stack([x, y], axis=2)
+
+
+def test_structured_outline(coords):
+    polygons = _make_grid(coords)
+    outline = polygonize_boundary(structured_boundary(polygons))
+    assert outline.equals(shapely.box(0, 0, 7, 5))
+
+
+def test_structured_outline_holes(coords):
+    polygons = _make_grid(coords)
+    mask = polygons.cell_mask.copy()
+    # A hole with an island cell inside.
+    mask[1:4, 1:4] = False
+    mask[2, 2] = True
+    # A cell that only touches the rest of the grid at a corner.
+    mask[3, 6] = mask[4, 5] = False
+    polygons = PolygonArray(
+        polygons.coords,
+        polygons.offsets,
+        mask.ravel(),
+        mask.shape,
+    )
+    outline = polygonize_boundary(structured_boundary(polygons))
+    assert outline.equals(union_outline(polygons))
+    assert outline.equals(parallel_union(polygons, workers=2))
+    assert outline.area == len(polygons)
+    n_parts = 3  # main grid, island, and corner cell
+    assert len(outline.geoms) == n_parts
+
+
+def test_boundary_edges():
+    # Two triangles sharing the (1, 2) edge.
+    faces = np.array([[0, 1, 2], [1, 3, 2]])
+    edges = boundary_edges(faces)
+    assert edges.tolist() == [[0, 1], [0, 2], [1, 3], [2, 3]]
+    x = np.array([0, 1, 0, 1], dtype=float)
+    y = np.array([0, 0, 1, 1], dtype=float)
+    segments = np.stack([x[edges], y[edges]], axis=2)
+    assert polygonize_boundary(segments).equals(shapely.box(0, 0, 1, 1))
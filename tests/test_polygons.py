@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+import shapely
+
+from gridgeo.polygons import PolygonArray
+
+
+@pytest.fixture
+def ragged():
+    coords = np.array(
+        [[0, 0], [1, 0], [1, 1], [1, 0], [2, 0], [2, 1], [1, 1], [5, 5]],
+        dtype=float,
+    )
+    mask = [True, True, False]
+    return PolygonArray.from_ragged(coords, [3, 4, 1], mask=mask)
+
+
+def test_from_cells():
+    cells = np.arange(24, dtype=float).reshape(3, 4, 2)
+    polygons = PolygonArray.from_cells(cells, mask=[True, False, True])
+    n_cells = 2
+    assert len(polygons) == n_cells
+    assert polygons.nvertices == cells.shape[1]
+    assert (polygons[0] == cells[0]).all()
+    assert (polygons[-1] == cells[2]).all()
+    assert (polygons.cells() == cells[[0, 2]]).all()
+    assert (polygons.index == [0, 2]).all()
+
+
+def test_mask_shape():
+    cells = np.zeros((3, 4, 2))
+    with pytest.raises(ValueError, match="Expected a mask with 3 cells"):
+        PolygonArray.from_cells(cells, mask=[True, False])
+
+
+def test_ragged_iteration(ragged):
+    n_vertices = [3, 4]
+    assert [len(p) for p in ragged] == n_vertices
+    assert ragged.nvertices is None
+    assert len(ragged[:]) == len(n_vertices)
+    with pytest.raises(ValueError, match="different number of vertices"):
+        ragged.cells()
+
+
+def test_ragged_to_shapely(ragged):
+    geometries = ragged.to_shapely()
+    assert shapely.area(geometries).tolist() == [0.5, 1.0]
+    n_vertices = [4, 5]  # closed rings
+    assert shapely.get_num_coordinates(geometries).tolist() == n_vertices
+
+
+def test_empty_to_shapely():
+    polygons = PolygonArray.from_cells(np.zeros((2, 4, 2)), mask=[False] * 2)
+    assert not len(polygons)
+    assert polygons.to_shapely().size == 0
+
+
+def test_centers(ragged):
+    centers = ragged.centers()
+    assert centers.tolist() == [[2 / 3, 1 / 3], [1.5, 0.5]]
+
+
+def test_concatenate_blocks():
+    cells = np.arange(48, dtype=float).reshape(6, 4, 2)
+    mask = np.array([True, False, True, True, True, False])
+    full = PolygonArray.from_cells(cells, mask=mask, shape=(3, 2))
+    blocks = [
+        PolygonArray.from_cells(cells[:4], mask=mask[:4], shape=(2, 2)),
+        PolygonArray.from_cells(
+            cells[4:],
+            mask=mask[4:],
+            shape=(1, 2),
+            start=4,
+        ),
+    ]
+    assert blocks[1].cell_indices() == {"j": [2], "i": [0]}
+    joined = PolygonArray.concatenate(blocks)
+    assert joined.shape == full.shape
+    assert (joined.coords == full.coords).all()
+    assert (joined.offsets == full.offsets).all()
+    assert (joined.mask == full.mask).all()
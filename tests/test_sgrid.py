@@ -1,9 +1,12 @@
 from pathlib import Path
 
 import numpy as np
+import pytest
 from shapely.geometry import MultiPolygon, Polygon
 
 import gridgeo
+from gridgeo.cfvariable import CFVariable
+from gridgeo.polygons import PolygonArray
 
 p = Path(__file__).parent.absolute()
 
@@ -28,7 +31,7 @@ def test_outline():
 
 
 def test_polygons():
-    assert isinstance(grid.polygons, _iterables)
+    assert isinstance(grid.polygons, PolygonArray)
     assert all(isinstance(p, _iterables) for p in grid.polygons)
     n_nodes = 4
     assert all(len(p) == n_nodes for p in grid.polygons)
@@ -69,3 +72,68 @@ def test_to_geojson():
     n_nodes = 5  # squares are 4+1
     assert len(coords[0][0]) == n_nodes
     assert str(coords[0][0][0][0]) == "-74.24"
+
+
+def test_cell_mask():
+    shape = (grid.y.shape[0] - 1, grid.x.shape[-1] - 1)
+    assert grid.cell_mask.shape == shape
+    assert grid.cell_mask.sum() == npoly
+
+
+def test_lazy():
+    lazy = gridgeo.GridGeo(
+        fname,
+        lazy=True,
+        standard_name="sea_water_potential_temperature",
+    )
+    assert lazy.mesh == grid.mesh
+    assert lazy._polygons is None  # noqa: SLF001
+    assert len(lazy.polygons) == npoly
+    assert lazy.geometry.equals_exact(grid.geometry, 0)
+    assert lazy.triang is None
+
+
+def test_lazy_reads(monkeypatch):
+    reads = []
+    read_axis = CFVariable.read_axis
+
+    def counted(self, name, *args, **kwargs):
+        reads.append(name)
+        return read_axis(self, name, *args, **kwargs)
+
+    monkeypatch.setattr(CFVariable, "read_axis", counted)
+    lazy = gridgeo.GridGeo(
+        fname,
+        lazy=True,
+        standard_name="sea_water_potential_temperature",
+    )
+    assert not reads
+    _ = lazy.polygons, lazy.x, lazy.y
+    lazy.locate(0, 0)
+    assert reads == ["x", "y"]
+
+
+def test_scheduler_name():
+    with pytest.raises(ValueError, match="Expected one of"):
+        gridgeo.GridGeo(
+            fname,
+            lazy=True,
+            scheduler="distributed",
+            standard_name="sea_water_potential_temperature",
+        )
+
+
+def test_outline_engines():
+    assert grid.compute_outline("boundary").equals(grid.outline)
+    assert grid.compute_outline("union").equals(grid.outline)
+    parallel = grid.compute_outline("parallel", workers=2)
+    assert parallel.equals(grid.outline)
+
+
+def test_locate():
+    centers = grid.polygons.centers()
+    index = grid.locate(centers[:, 0], centers[:, 1])
+    assert (index == grid.polygons.index).all()
+    assert grid.locate(0, 0) == -1
+    j, i = np.unravel_index(grid.locate(*centers[-1]), grid.cell_mask.shape)
+    assert (j, i) == (grid.cell_mask.shape[0] - 1, grid.cell_mask.shape[1] - 1)
@@ -4,6 +4,7 @@ import numpy as np
 from shapely.geometry import MultiPolygon, Polygon
 
 import gridgeo
+from gridgeo.polygons import PolygonArray
 
 p = Path(__file__).parent.absolute()
 
@@ -28,7 +29,7 @@ def test_outline():
 
 
 def test_polygons():
-    assert isinstance(grid.polygons, _iterables)
+    assert isinstance(grid.polygons, PolygonArray)
     assert all(isinstance(p, _iterables) for p in grid.polygons)
     n_nodes = 3
     assert all(len(p) == n_nodes for p in grid.polygons)
@@ -69,3 +70,8 @@ def test_to_geojson():
     n_nodes = 4  # triangles are 3+1
     assert len(coords[0][0]) == n_nodes
     assert str(coords[0][0][0][0]) == "-87.25"
+
+
+def test_cell_mask():
+    assert grid.cell_mask.shape == (npoly,)
+    assert grid.cell_mask.all()
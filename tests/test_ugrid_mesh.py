@@ -0,0 +1,283 @@
+import netCDF4
+import numpy as np
+import pytest
+import shapely
+from conftest import faces, node_x, node_y, write_ugrid
+
+import gridgeo
+from gridgeo import cfvariable
+from gridgeo.cache import DiskCache
+from gridgeo.ugrid import (
+    UGridMesh,
+    boundary_connectivity,
+    connectivity_array,
+    edge_connectivity,
+    face_face_connectivity,
+    triangulate,
+    ugrid,
+)
+
+
+def test_connectivity_array(ugrid_file):
+    with netCDF4.Dataset(ugrid_file) as nc:
+        grid = ugrid(nc).load()
+    np.testing.assert_array_equal(grid["faces"], faces)
+
+
+def test_ugrid_mesh(ugrid_file):
+    with netCDF4.Dataset(ugrid_file) as nc:
+        mesh = ugrid(nc)
+        assert isinstance(mesh, UGridMesh)
+        assert mesh.name == "mesh"
+        assert {"nodes", "faces"} <= set(mesh)
+        assert mesh.loaded == []
+        np.testing.assert_array_equal(mesh.node_x, node_x)
+        np.testing.assert_array_equal(mesh.node_y, node_y)
+        assert mesh.faces is mesh["faces"]
+        assert sorted(mesh.loaded) == ["faces", "nodes"]
+
+
+def test_ugrid_load(ugrid_file):
+    with netCDF4.Dataset(ugrid_file) as nc:
+        mesh = ugrid(nc, load=("faces",))
+        assert list(mesh) == ["faces"]
+        np.testing.assert_array_equal(mesh.faces, faces)
+        with pytest.raises(KeyError):
+            mesh["nodes"]
+        with pytest.raises(ValueError, match="volumes"):
+            ugrid(nc, load=("faces", "volumes"))
+
+
+def test_mesh_parsed_once(ugrid_file, monkeypatch):
+    calls = []
+
+    def counted(nc):
+        calls.append(nc)
+        return ugrid(nc)
+
+    monkeypatch.setattr(cfvariable, "ugrid", counted)
+    grid = gridgeo.GridGeo(
+        ugrid_file,
+        standard_name="sea_water_potential_temperature",
+    )
+    assert grid.polygons is not None
+    assert grid.outline.equals(shapely.box(0, 0, 2, 2))
+    if gridgeo.gridgeo.tri:
+        assert grid.triang is not None
+    assert grid.variable.ugrid() is grid.variable.ugrid()
+    assert len(calls) == 1
+
+
+def test_node_axes_read_once(ugrid_file):
+    grid = gridgeo.GridGeo(
+        ugrid_file,
+        standard_name="sea_water_potential_temperature",
+    )
+    mesh = grid.variable.ugrid()
+    # The axes are the node coordinates read by the mesh.
+    assert grid.x is mesh.node_x
+    assert grid.y is mesh.node_y
+    np.testing.assert_array_equal(grid.x, node_x)
+
+
+def test_connectivity_array_leading_padding(tmp_path):
+    with netCDF4.Dataset(tmp_path.joinpath("padded.nc"), "w") as nc:
+        nc.createDimension("face", 2)
+        nc.createDimension("nmax", 4)
+        var = nc.createVariable("nv", "i4", ("face", "nmax"), fill_value=-1)
+        var[:] = [[-1, 0, 1, 2], [0, 2, 3, 4]]
+        array = connectivity_array(var, 3)
+    np.testing.assert_array_equal(array, [[0, 1, 2, -1], [0, 2, 3, 4]])
+
+
+def test_mixed_polygons(ugrid_file):
+    grid = gridgeo.GridGeo(
+        ugrid_file,
+        standard_name="sea_water_potential_temperature",
+    )
+    assert grid.mesh == "ugrid"
+    assert grid.polygons.ring_sizes.tolist() == [4, 3, 3, 4, 4]
+    for cell, face in zip(grid.polygons, faces, strict=True):
+        nodes = face[face >= 0]
+        expected = np.column_stack([node_x[nodes], node_y[nodes]])
+        np.testing.assert_array_equal(cell, expected)
+    assert all(cell.is_valid for cell in grid.cells)
+    assert shapely.union_all(grid.cells).area == pytest.approx(4)
+    assert grid.outline.equals(shapely.box(0, 0, 2, 2))
+    assert grid.compute_outline("union").equals(grid.outline)
+
+
+def test_mixed_triangulation(ugrid_file):
+    pytest.importorskip("matplotlib")
+    grid = gridgeo.GridGeo(
+        ugrid_file,
+        standard_name="sea_water_potential_temperature",
+    )
+    ntriangles = 8
+    assert grid.triang.triangles.shape == (ntriangles, 3)
+
+
+def test_mixed_locate(ugrid_file):
+    grid = gridgeo.GridGeo(
+        ugrid_file,
+        standard_name="sea_water_potential_temperature",
+    )
+    index = grid.locate([0.5, 1.8, 5], [0.5, 0.1, 5])
+    assert index.tolist() == [0, 1, -1]
+    with pytest.raises(ValueError, match="mixed meshes"):
+        grid.locate(0.5, 0.5, engine="kdtree")
+
+
+def test_mixed_bbox(ugrid_file):
+    grid = gridgeo.GridGeo(
+        ugrid_file,
+        bbox=(1.2, 0.2, 1.8, 0.4),
+        standard_name="sea_water_potential_temperature",
+    )
+    assert grid.cell_mask.tolist() == [False, True, True, False, False]
+
+
+def test_triangulate():
+    triangles, index = triangulate(faces)
+    assert index.tolist() == [0, 0, 1, 2, 3, 3, 4, 4]
+    assert triangles[:2].tolist() == [[0, 1, 4], [0, 4, 3]]
+    assert triangles[2].tolist() == [1, 2, 5]
+
+
+def test_edge_connectivity():
+    edges, face_edges = edge_connectivity(faces)
+    nedges = 13
+    assert edges.shape == (nedges, 2)
+    assert (edges[:, 0] < edges[:, 1]).all()
+    assert edges[face_edges[1]].tolist()[:3] == [[1, 2], [2, 5], [1, 5]]
+    assert face_edges[1, 3] == -1
+    face_face = face_face_connectivity(face_edges)
+    assert face_face.tolist() == [
+        [-1, 2, 3, -1],
+        [-1, -1, 2, -1],
+        [1, 4, 0, -1],
+        [0, 4, -1, -1],
+        [2, -1, -1, 3],
+    ]
+    boundaries = boundary_connectivity(edges, face_edges)
+    nboundaries = 8
+    assert boundaries.shape == (nboundaries, 2)
+    assert [1, 4] not in boundaries.tolist()
+
+
+def test_derived_connectivity(ugrid_file):
+    with netCDF4.Dataset(ugrid_file) as nc:
+        mesh = ugrid(nc, load=("nodes", "face_face_connectivity"))
+        assert list(mesh) == ["nodes", "face_face_connectivity"]
+        face_face = mesh["face_face_connectivity"]
+        mesh = ugrid(nc).load()
+    assert {"edges", "boundaries", "face_edge_connectivity"} <= set(mesh)
+    edges, face_edges = edge_connectivity(faces)
+    np.testing.assert_array_equal(mesh["edges"], edges)
+    np.testing.assert_array_equal(mesh["face_edge_connectivity"], face_edges)
+    np.testing.assert_array_equal(
+        face_face,
+        face_face_connectivity(face_edges),
+    )
+    np.testing.assert_array_equal(
+        mesh["boundaries"],
+        boundary_connectivity(edges, face_edges),
+    )
+    # Faces 1 and 2 share the 1-5 edge, now on the boundary.
+    mask = np.array([True, True, False, True, True])
+    assert [1, 5] in mesh.boundary_edges(mask).tolist()
+
+
+def test_dataset_edges(tmp_path):
+    fname = tmp_path.joinpath("edges.nc")
+    write_ugrid(fname, "fill")
+    edges, face_edges = edge_connectivity(faces)
+    # Reversed rows with swapped nodes, unlike the derived edges.
+    dataset_edges = edges[::-1, ::-1]
+    with netCDF4.Dataset(fname, "a") as nc:
+        nc.createDimension("edge", len(dataset_edges))
+        nc.createDimension("two", 2)
+        var = nc.createVariable("edge_nodes", "i4", ("edge", "two"))
+        var.cf_role = "edge_node_connectivity"
+        var[:] = dataset_edges
+        nc["mesh"].edge_node_connectivity = "edge_nodes"
+        nc["mesh"].edge_dimension = "edge"
+        mesh = ugrid(nc).load()
+    np.testing.assert_array_equal(mesh["edges"], dataset_edges)
+    face_edge = mesh["face_edge_connectivity"]
+    assert face_edge[0].tolist() == [12, 9, 6, 11]
+    # The edge k of a face joins its nodes k and k + 1.
+    for face, rows in zip(faces, face_edge, strict=True):
+        nodes = face[face >= 0]
+        sides = np.sort(np.column_stack([nodes, np.roll(nodes, -1)]), axis=1)
+        used = np.sort(mesh["edges"][rows[rows >= 0]], axis=1)
+        np.testing.assert_array_equal(used, sides)
+    np.testing.assert_array_equal(
+        mesh["face_face_connectivity"],
+        face_face_connectivity(face_edges),
+    )
+    assert sorted(map(tuple, mesh["boundaries"].tolist())) == sorted(
+        map(tuple, boundary_connectivity(edges, face_edges).tolist()),
+    )
+
+
+def test_cache_hit(ugrid_file, tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path.joinpath("cache"))
+    selector = {"standard_name": "sea_water_potential_temperature"}
+    grid = gridgeo.GridGeo(ugrid_file, cache=cache, **selector)
+    outline = grid.outline
+
+    def no_reads(*_args, **_kwargs):
+        msg = "Read from the dataset."
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(cfvariable, "ugrid", no_reads)
+    monkeypatch.setattr(cfvariable.CFVariable, "read_axis", no_reads)
+    cached = gridgeo.GridGeo(ugrid_file, cache=cache, **selector)
+    np.testing.assert_array_equal(cached.polygons.coords, grid.polygons.coords)
+    assert cached.outline.equals(outline)
+    assert cached.compute_outline("boundary").equals(outline)
+    if gridgeo.gridgeo.tri:
+        np.testing.assert_array_equal(
+            cached.triang.triangles,
+            grid.triang.triangles,
+        )
+
+
+def test_from_files(tmp_path, monkeypatch):
+    paths = [tmp_path.joinpath(f"run_{k}.nc") for k in range(3)]
+    for path in paths:
+        write_ugrid(path, "fill")
+    calls = []
+
+    def counted(nc, *args, **kwargs):
+        calls.append(nc)
+        return ugrid(nc, *args, **kwargs)
+
+    monkeypatch.setattr(cfvariable, "ugrid", counted)
+    grids = gridgeo.GridGeo.from_files(
+        paths,
+        standard_name="sea_water_potential_temperature",
+    )
+    # The mesh of each file is parsed once, for its digest and its grid.
+    assert len(calls) == len(paths)
+    assert all(grid.polygons is grids[0].polygons for grid in grids)
+    assert grids[-1].outline.equals(shapely.box(0, 0, 2, 2))
+
+
+def test_from_files_closed(tmp_path):
+    paths = [tmp_path.joinpath(f"run_{k}.nc") for k in range(2)]
+    for path in paths:
+        write_ugrid(path, "fill")
+    grids = gridgeo.GridGeo.from_files(
+        paths,
+        bbox=(0, 0, 1, 1),
+        standard_name="sea_water_potential_temperature",
+    )
+    for grid in grids:
+        assert grid.window is None
+        assert grid.grid_shape == (len(faces),)
+        assert grid.locate(0.5, 0.5) == 0
+        # The queries do not open the datasets again.
+        assert grid._var is None  # noqa: SLF001
+        assert not grid._nc.isopen()  # noqa: SLF001
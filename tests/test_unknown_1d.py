@@ -4,6 +4,7 @@ import numpy as np
 from shapely.geometry import MultiPolygon, Polygon
 
 import gridgeo
+from gridgeo.polygons import PolygonArray
 
 # The netcdf file used here is based on
 # $ url="http://colossus.dl.stevens-tech.edu:8080/thredds/dodsC/latest/Complete_gcmplt.nc"
@@ -37,7 +38,7 @@ def test_outline():
 
 
 def test_polygons():
-    assert isinstance(grid.polygons, _iterables)
+    assert isinstance(grid.polygons, PolygonArray)
     assert all(isinstance(p, _iterables) for p in grid.polygons)
     n_nodes = 4
     assert all(len(p) == n_nodes for p in grid.polygons)
@@ -78,3 +79,9 @@ def test_to_geojson():
     n_nodes = 5  # squares are 4+1
     assert len(coords[0][0]) == n_nodes
     assert str(coords[0][0][0][0]) == "232.5"
+
+
+def test_cell_mask():
+    shape = (grid.y.shape[0] - 1, grid.x.shape[-1] - 1)
+    assert grid.cell_mask.shape == shape
+    assert grid.cell_mask.sum() == npoly
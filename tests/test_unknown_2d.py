@@ -4,6 +4,7 @@ import numpy as np
 from shapely.geometry import MultiPolygon, Polygon
 
 import gridgeo
+from gridgeo.polygons import PolygonArray
 
 p = Path(__file__).parent.absolute()
 
@@ -29,7 +30,7 @@ def test_outline():
 
 
 def test_polygons():
-    assert isinstance(grid.polygons, _iterables)
+    assert isinstance(grid.polygons, PolygonArray)
     assert all(isinstance(p, _iterables) for p in grid.polygons)
     n_nodes = 4
     assert all(len(p) == n_nodes for p in grid.polygons)
@@ -70,3 +71,25 @@ def test_to_geojson():
     n_nodes = 5  # squares are 4+1
     assert len(coords[0][0]) == n_nodes
     assert str(coords[0][0][0][0]) == "-74.29"
+
+
+def test_cell_mask():
+    shape = (grid.y.shape[0] - 1, grid.x.shape[-1] - 1)
+    assert grid.cell_mask.shape == shape
+    assert grid.cell_mask.sum() == npoly
+
+
+def test_outline_engines():
+    assert grid.compute_outline("boundary").equals(grid.outline)
+    assert grid.compute_outline("union").equals(grid.outline)
+    parallel = grid.compute_outline("parallel", workers=2)
+    assert parallel.equals(grid.outline)
+
+
+def test_locate():
+    centers = grid.polygons.centers()
+    index = grid.locate(centers[:, 0], centers[:, 1])
+    assert (index == grid.polygons.index).all()
+    # The shared corner of the first 4 cells goes to the lowest index.
+    corner = grid.polygons[0][2]
+    assert grid.locate(*corner) == grid.polygons.index[0]
@@ -0,0 +1,195 @@
+import io
+import json
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+import pytest
+import shapely
+
+import gridgeo
+from gridgeo.gridgeo import set_precision
+from gridgeo.polygons import PolygonArray
+from gridgeo.writers import _round, iter_rings, write_geojson
+
+p = Path(__file__).parent.absolute()
+
+
+def test_save_geojson(grid, tmp_path):
+    fname = tmp_path.joinpath("grid.geojson")
+    grid.save(fname, float_precision=4)
+    with fname.open() as f:
+        saved = json.load(f)
+    assert saved == grid.to_geojson(float_precision=4)
+
+
+def test_to_geojson_precision(grid):
+    coords = grid.geometry.__geo_interface__["coordinates"]
+    geojson = grid.to_geojson(float_precision=3)
+    assert geojson["geometry"]["coordinates"] == set_precision(coords, 3)
+
+
+def test_set_precision():
+    nested = [[(1.23456, 2.34567)], [(3.45678, 4.56789)]]
+    expected = [[[1.23, 2.35]], [[3.46, 4.57]]]
+    assert set_precision(nested, 2) == expected
+    assert set_precision(np.array(nested), 2) == expected
+
+
+def test_round_half_way():
+    values = [2.675, -70.1234565, 0.125, 1.005, -2.5, 10.0, 0.3]
+    precisions = [2, 6, 2, 2, 0, 1, 1]
+    for value, precision in zip(values, precisions, strict=True):
+        expected = round(value, precision)
+        assert set_precision([value], precision) == [expected]
+        assert set_precision(np.array([value]), precision) == [expected]
+    rng = np.random.default_rng(0)
+    coords = np.round(rng.uniform(-180, 180, 10000), 7) + 5e-7
+    expected = [round(value, 6) for value in coords.tolist()]
+    assert _round(coords, 6).tolist() == expected
+
+
+def test_iter_rings_ragged():
+    coords = np.array(
+        [[0, 0], [1, 0], [1, 1], [1, 0], [2, 0], [2, 1], [1, 1]],
+        dtype=float,
+    )
+    coords[:, 0] += 0.123456789
+    polygons = PolygonArray.from_ragged(coords, [3, 4])
+    batches = iter_rings(polygons, float_precision=2, batch_size=1)
+    rings = list(chain.from_iterable(batches))
+    assert rings == [
+        [[0.12, 0.0], [1.12, 0.0], [1.12, 1.0], [0.12, 0.0]],
+        [[1.12, 0.0], [2.12, 0.0], [2.12, 1.0], [1.12, 1.0], [1.12, 0.0]],
+    ]
+
+
+def test_write_geojson_empty():
+    polygons = PolygonArray.from_cells(np.zeros((2, 4, 2)), mask=[False] * 2)
+    f = io.StringIO()
+    write_geojson(f, polygons, {"title": "empty"})
+    geojson = json.loads(f.getvalue())
+    assert geojson["geometry"] == {"coordinates": [], "type": "MultiPolygon"}
+
+
+def test_to_geojson_per_cell(grid):
+    geojson = grid.to_geojson(per_cell=True, float_precision=4)
+    assert geojson["type"] == "FeatureCollection"
+    features = geojson["features"]
+    assert len(features) == len(grid.polygons)
+    j, i = np.nonzero(grid.cell_mask)
+    assert features[-1]["properties"] == {"j": j[-1], "i": i[-1]}
+    assert features[-1]["geometry"]["type"] == "Polygon"
+
+
+def test_save_geojson_per_cell(grid, tmp_path):
+    fname = tmp_path.joinpath("grid.geojson")
+    grid.save(fname, per_cell=True, float_precision=4)
+    with fname.open() as f:
+        saved = json.load(f)
+    assert saved == grid.to_geojson(per_cell=True, float_precision=4)
+
+
+@pytest.mark.parametrize("fmt", ["shp", "gpkg"])
+def test_save_per_cell_records(grid, tmp_path, fmt):
+    fiona = pytest.importorskip("fiona")
+    fname = tmp_path.joinpath(f"grid.{fmt}")
+    grid.save(fname, per_cell=True)
+    with fiona.open(fname) as f:
+        assert len(f) == len(grid.polygons)
+        feature = next(iter(f))
+    j, i = np.nonzero(grid.cell_mask)
+    assert dict(feature.properties) == {"j": j[0], "i": i[0]}
+
+
+@pytest.mark.parametrize("encoding", ["WKB", "polygon"])
+def test_to_arrow(grid, encoding):
+    pytest.importorskip("pyarrow")
+    columns = {"valid": grid.cell_mask.astype(int)}
+    table = grid.to_arrow(columns=columns, encoding=encoding)
+    assert table.num_rows == len(grid.polygons)
+    assert table.column_names == ["j", "i", "valid", "geometry"]
+    geo = json.loads(table.schema.metadata[b"geo"])
+    assert geo["columns"]["geometry"]["encoding"] == encoding
+    j, i = np.nonzero(grid.cell_mask)
+    assert table["j"].to_numpy().tolist() == j.tolist()
+    assert table["i"].to_numpy().tolist() == i.tolist()
+    if encoding == "WKB":
+        geometries = shapely.from_wkb(table["geometry"].to_numpy())
+    else:
+        rings = table["geometry"].to_pylist()
+        geometries = [
+            shapely.Polygon([(v["x"], v["y"]) for v in ring[0]])
+            for ring in rings
+        ]
+    expected = grid.polygons.to_shapely()
+    assert shapely.equals_exact(geometries, expected, 0).all()
+
+
+def test_to_arrow_column_shape(grid):
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError, match="Expected a column with shape"):
+        grid.to_arrow(columns={"bad": np.zeros(3)})
+
+
+def test_save_parquet(grid, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    fname = tmp_path.joinpath("grid.parquet")
+    grid.save(fname)
+    table = pq.read_table(fname)
+    assert table.num_rows == len(grid.polygons)
+    assert b"geo" in table.schema.metadata
+
+
+@pytest.fixture
+def blocked(dataset, selector):
+    pytest.importorskip("dask")
+    fname = p.joinpath("data", dataset)
+    return gridgeo.GridGeo(fname, block_rows=32, **selector)
+
+
+def test_block_polygons(blocked):
+    assert blocked._polygons is None  # noqa: SLF001
+    full = blocked.variable.polygons()
+    polygons = blocked.polygons
+    assert polygons.shape == full.shape
+    np.testing.assert_array_equal(polygons.coords, full.coords)
+    np.testing.assert_array_equal(polygons.mask, full.mask)
+
+
+def test_save_blocks(blocked, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    grid = gridgeo.GridGeo(
+        blocked.variable._nc,  # noqa: SLF001
+        standard_name=blocked.variable.standard_name,
+    )
+    fname = tmp_path.joinpath("grid.geojson")
+    blocked.save(fname, float_precision=4, per_cell=True)
+    assert blocked._polygons is None  # noqa: SLF001
+    with fname.open() as f:
+        saved = json.load(f)
+    assert saved == grid.to_geojson(float_precision=4, per_cell=True)
+
+    fname = tmp_path.joinpath("grid.parquet")
+    mask = grid.cell_mask.astype(int)
+    blocked.save(fname, columns={"mask": mask})
+    table = pq.read_table(fname)
+    expected = grid.to_arrow(columns={"mask": mask})
+    assert table.drop_columns("geometry").equals(
+        expected.drop_columns("geometry"),
+    )
+    assert table["geometry"].equals(expected["geometry"])
+
+
+@pytest.mark.parametrize("fmt", ["shp", "gpkg"])
+def test_save_blocks_records(blocked, tmp_path, fmt):
+    fiona = pytest.importorskip("fiona")
+    fname = tmp_path.joinpath(f"grid.{fmt}")
+    blocked.save(fname, per_cell=True)
+    assert blocked._polygons is None  # noqa: SLF001
+    with fiona.open(fname) as f:
+        properties = [dict(feature.properties) for feature in f]
+    j, i = np.nonzero(blocked.cell_mask)
+    assert properties == [
+        {"j": a, "i": b} for a, b in zip(j.tolist(), i.tolist(), strict=True)
+    ]